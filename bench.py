@@ -0,0 +1,120 @@
+import sys, os, json, time, argparse, subprocess, tempfile
+
+try:
+    import resource
+except ImportError:  # windows: no peak rss
+    resource = None
+
+from stub_server import StubServer
+
+# throughput / latency / stop-latency / memory benchmark against the local stub.
+# every case runs in its own process so peak memory and thread state don't leak
+
+
+def percentile(vals, p):
+    if not vals: return float("nan")
+    return vals[min(len(vals) - 1, int(round(p / 100 * (len(vals) - 1))))]
+
+
+def peak_mb():
+    # largest single process: this one, or the biggest shard of a sharded run
+    if resource is None: return None
+    rss = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+def run_case(case):
+    # child side: one full run for throughput + latency, one stopped run for stop latency
+    import dark_matter_checker as dm
+    wd = case["workdir"]
+    out = os.path.join(wd, f"out_{os.getpid()}.jsonl")
+    kw = dict(threads=case["threads"], engine=case["engine"], url=case["url"],
+        out_fmt="jsonl", cache_path=":memory:")
+    if case.get("timeout"): kw["timeout"] = case["timeout"]
+
+    kw["shards"] = case.get("shards", 1)
+
+    e = dm.make_engine("bench", path=case["names"], out_path=out, **kw)
+    e.run()
+    with open(out, encoding="utf-8") as f:
+        lat = sorted(r["latency_ms"] for r in map(json.loads, f) if r["latency_ms"] is not None)
+
+    stop_lat = None
+    if case["stop_after"] > 0:
+        s = dm.make_engine("bench", path=case["names"], out_path=out + ".stop", **kw).start()
+        time.sleep(case["stop_after"])
+        t = time.perf_counter()
+        s.stop()
+        s.wait()
+        stop_lat = time.perf_counter() - t
+
+    return {"engine": case["engine"], "threads": case["threads"], "shards": kw["shards"], "names": case["size"],
+        "checked": e.checked, "errors": e.errs, "elapsed": round(e.elapsed, 3),
+        "names_per_s": round(e.checked / max(e.elapsed, 1e-9), 1),
+        "p50_ms": percentile(lat, 50), "p95_ms": percentile(lat, 95), "p99_ms": percentile(lat, 99),
+        "stop_s": None if stop_lat is None else round(stop_lat, 3), "peak_mb": peak_mb()}
+
+
+def fmt(v, width, prec=1):
+    return "—".rjust(width) if v is None else f"{v:>{width}.{prec}f}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="benchmark the checker against a local stub endpoint")
+    ap.add_argument("--threads", default="10,50,100", help="comma list of thread / in-flight counts")
+    ap.add_argument("--shards", default="1", help="comma list of shard process counts")
+    ap.add_argument("--sizes", default="1000,5000", help="comma list of list sizes")
+    ap.add_argument("--engines", default="threads", help="comma list: threads,async")
+    ap.add_argument("--latency", default="lognormal:40:0.5", help="stub latency spec, see stub_server.py")
+    ap.add_argument("--malformed", type=float, default=0.01)
+    ap.add_argument("--drop", type=float, default=0.0)
+    ap.add_argument("--rate-limit", type=float, help="stub requests/s before limiting")
+    ap.add_argument("--retry-after", type=float)
+    ap.add_argument("--stall", type=float, default=0.0, help="share of stub requests that hang")
+    ap.add_argument("--stall-s", type=float, default=30.0)
+    ap.add_argument("--timeout", type=float, help="checker timeout ceiling, s")
+    ap.add_argument("--stop-after", type=float, default=1.0, help="seconds before the stop-latency probe, 0 = skip")
+    ap.add_argument("--json", metavar="FILE", help="also write results as json")
+    ap.add_argument("--case", help=argparse.SUPPRESS)
+    a = ap.parse_args(argv)
+
+    if a.case:
+        print(json.dumps(run_case(json.loads(a.case))))
+        return 0
+
+    stub = StubServer(latency=a.latency, malformed=a.malformed, drop=a.drop,
+        rate_limit=a.rate_limit, retry_after=a.retry_after, stall=a.stall, stall_s=a.stall_s).start()
+    results = []
+    hdr = f"{'engine':<8}{'thr':>5}{'sh':>4}{'names':>8}{'names/s':>10}{'p50':>8}{'p95':>8}{'p99':>8}{'stop s':>8}{'peak MB':>9}{'errs':>6}"
+    print(f"stub {stub.url}  latency {a.latency}")
+    print(hdr)
+    print("-" * len(hdr))
+    with tempfile.TemporaryDirectory() as wd:
+        for size in map(int, a.sizes.split(",")):
+            names = os.path.join(wd, f"names_{size}.txt")
+            with open(names, "w", encoding="utf-8") as f:
+                f.writelines(f"bench{i:08d}\n" for i in range(size))
+            for engine in a.engines.split(","):
+                for thr, sh in ((t, s) for t in map(int, a.threads.split(",")) for s in map(int, a.shards.split(","))):
+                    case = {"engine": engine, "threads": thr, "shards": sh, "size": size, "names": names,
+                        "url": stub.url, "workdir": wd, "stop_after": a.stop_after, "timeout": a.timeout}
+                    p = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", json.dumps(case)],
+                        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+                    if p.returncode:
+                        print(f"{engine:<8}{thr:>5}{sh:>4}{size:>8}  failed: {p.stderr.strip().splitlines()[-1:]}")
+                        continue
+                    r = json.loads(p.stdout.strip().splitlines()[-1])
+                    results.append(r)
+                    print(f"{engine:<8}{thr:>5}{sh:>4}{size:>8}{r['names_per_s']:>10.1f}{r['p50_ms']:>8.1f}"
+                        f"{r['p95_ms']:>8.1f}{r['p99_ms']:>8.1f}{fmt(r['stop_s'], 8, 2)}"
+                        f"{fmt(r['peak_mb'], 9)}{r['errors']:>6}", flush=True)
+    stub.stop()
+    print(f"stub hits: {stub.hits}")
+    if a.json:
+        with open(a.json, "w", encoding="utf-8") as f:
+            json.dump({"latency": a.latency, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,97 +1,48 @@
-import customtkinter as ctk
-import tkinter as tk
-from tkinter import filedialog
-import requests, json, threading, itertools
-import time, math, random
-from queue import Queue
-
-# colors
-BG = "#08080f"
-SURFACE = "#111128"
-CARD = "#16163a"
-BORDER = "#252560"
-ACCENT = "#7c3aed"
-ACCENT_HVR = "#9333ea"
-ACCENT_LT = "#a78bfa"
-ACCENT_DIM = "#4c1d95"
-GREEN = "#10b981"
-RED = "#ef4444"
-AMBER = "#f59e0b"
-CYAN = "#06b6d4"
-TEXT = "#e2e8f0"
-TEXT_DIM = "#94a3b8"
-TEXT_MUTED = "#475569"
-P_COLORS = ["#7c3aed", "#6d28d9", "#8b5cf6", "#4c1d95", "#312e81"]
-
-
-class Particle:
-    def __init__(self, w, h):
-        self.x = random.uniform(0, w)
-        self.y = random.uniform(0, h)
-        self.r = random.uniform(1.0, 2.8)
-        self.vx = random.uniform(-0.35, 0.35)
-        self.vy = random.uniform(-0.35, 0.35)
-        self.base_a = random.uniform(0.35, 1.0)
-        self.phase = random.uniform(0, math.tau)
-        self.freq = random.uniform(0.012, 0.035)
-        self.color = random.choice(P_COLORS)
-        self.w, self.h = w, h
-        self.alpha = self.base_a
-
-    def step(self, t):
-        self.x = (self.x + self.vx) % self.w
-        self.y = (self.y + self.vy) % self.h
-        self.alpha = self.base_a * (0.45 + 0.55 * math.sin(t * self.freq + self.phase))
-
-
-def blend(hex_c, alpha):
-    a = max(0.0, min(1.0, alpha))
-    r1, g1, b1 = int(hex_c[1:3], 16), int(hex_c[3:5], 16), int(hex_c[5:7], 16)
-    r0, g0, b0 = 8, 8, 15  # bg rgb
-    return f"#{int(r1*a+r0*(1-a)):02x}{int(g1*a+g0*(1-a)):02x}{int(b1*a+b0*(1-a)):02x}"
-
-
-class ParticleCanvas(tk.Canvas):
-    def __init__(self, master, w=720, h=110, n=50, **kw):
-        super().__init__(master, width=w, height=h, bg=BG, highlightthickness=0, **kw)
-        self._cw, self._ch, self._tick = w, h, 0
-        self.particles = [Particle(w, h) for _ in range(n)]
-
-        self.dots = [self.create_oval(0,0,0,0, fill=p.color, outline="") for p in self.particles]
-        self.max_lines = 90
-        self.lines = [self.create_line(0,0,0,0, fill="", width=1) for _ in range(self.max_lines)]
-
-        self.create_text(w//2, h//2 - 14, text="DARK MATTER", font=("Segoe UI", 26, "bold"), fill=TEXT)
-        self.create_text(w//2, h//2 + 16, text="ai.com Botname Checker", font=("Segoe UI", 11), fill=TEXT_DIM)
-        self.create_text(w - 8, h - 6, text="credits to @crysiox", font=("Segoe UI", 8), fill=TEXT_MUTED, anchor="se")
-
-        self._animate()
-
-    def _animate(self):
-        self._tick += 1
-        ci = 0
-
-        for i, p in enumerate(self.particles):
-            p.step(self._tick)
-            r = p.r * (0.75 + 0.5 * p.alpha)
-            self.coords(self.dots[i], p.x-r, p.y-r, p.x+r, p.y+r)
-            self.itemconfigure(self.dots[i], fill=blend(p.color, p.alpha))
-
-            for j in range(i+1, len(self.particles)):
-                if ci >= self.max_lines: break
-                q = self.particles[j]
-                dx, dy = p.x - q.x, p.y - q.y
-                d = math.sqrt(dx*dx + dy*dy)
-                if d < 105:
-                    la = (1 - d/105) * 0.28 * min(p.alpha, q.alpha)
-                    self.coords(self.lines[ci], p.x, p.y, q.x, q.y)
-                    self.itemconfigure(self.lines[ci], fill=blend(ACCENT_LT, la))
-                    ci += 1
-
-        for k in range(ci, self.max_lines):
-            self.coords(self.lines[k], -1,-1,-1,-1)
-
-        self.after(33, self._animate)
+import json, threading, itertools
+import time, math, os, csv, sqlite3, hashlib, sys, argparse, zlib, shutil
+import importlib.util, io, re
+from array import array
+from bisect import bisect_left
+from enum import IntEnum
+from contextlib import contextmanager
+from queue import Queue, SimpleQueue, Empty
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# requests, asyncio and aiohttp are imported where they are used, and the gui
+# lives in dark_matter_gui.py, so the headless cli never loads tk
+
+CHECK_URL = os.environ.get("DM_CHECK_URL") or "https://api.ai.com/user/botname/check"
+POOL_SIZE = None    # keep-alive connections per route, None = thread count
+MAX_THREADS = 100
+MAX_INFLIGHT = 1000 # async engine concurrency cap
+ENGINES = ("threads", "async")
+RATE_LIMIT_MSG = "exceeded the site's rate limits"
+RL_COOLDOWN = 10.0  # global pause after a limit when there is no Retry-After
+RL_MIN_RATE = 0.5   # req/s floor for adaptive pacing
+RL_RAMP = 0.5       # req/s regained per second without limits
+ICONS = {"avail": "\u2713", "taken": "\u2717", "err": "\u26a0"}
+OUT_FILES = {"txt": "checked.txt", "jsonl": "checked.jsonl", "csv": "checked.csv"}
+OUT_FLUSH_S = 1.0   # writer flush interval
+OUT_FLUSH_N = 500   # ...or after this many buffered results
+CACHE_FILE = "checked.db"
+RULES_FILE = "rules.json"  # response rules, defaults to DEFAULT_RULES when missing
+METRICS_FILES = {"json": "metrics.json", "prom": "metrics.prom"}
+METRICS_S = 5.0     # metrics snapshot interval
+RATE_WINDOW = 10    # seconds of history behind the live rate and eta
+PROFILE_FILE = "profile.txt"
+STOP_GRACE = 0.5    # seconds in-flight requests get to finish after a stop
+TIMEOUT_MAX = 15.0  # request timeout ceiling, s
+TIMEOUT_MIN = 1.0   # adaptive budgets never go below this
+TIMEOUT_CONNECT = 5.0  # connect budget until there is latency data
+TIMEOUT_MULT = 3.0  # budget = this x observed p50 (connect) / p99 (read)
+TIMEOUT_RETRIES = 2 # timed out requests retried on a fresh connection, the last one at the ceiling
+TIMEOUT_BACKOFF = 2.0  # a timeout widens the budget that fired by this much
+MAX_SHARDS = 32
+SHARD_REPORT_S = 0.25  # how often a shard process sends rows and counters up
+SHARD_STOP_WAIT = 5.0  # after a stop, shards still running this much later are killed
+MIN_LEN = 4
 
 
 # proxy stuff
@@ -126,6 +77,11 @@ class ProxyCycler:
         with self._lock:
             return len(self._live)
 
+    @property
+    def dead(self):
+        with self._lock:
+            return sorted(self._dead)
+
     def next(self):
         with self._lock:
             if not self._cycle or not self._live: return None
@@ -140,364 +96,1589 @@ class ProxyCycler:
                 self._cycle = itertools.cycle(self._live) if self._live else None
 
 
-# main gui
+# response handling
+
+class Outcome(IntEnum):
+    # classifier verdicts; the first three are stored as the Status of the same value
+    AVAIL = 0
+    TAKEN = 1
+    ERR = 2
+    LIMITED = 3
+
+
+DEFAULT_RULES = (
+    # first match wins. "field" rules look at the parsed json reply ("a.b" for
+    # nested keys, "equals" optional), "contains" / "regex" rules match the raw
+    # reply case-insensitively, but skip json replies unless marked "json": a
+    # word like "available" inside an error object is no verdict. A rules.json
+    # with the same shape replaces these
+    {"contains": RATE_LIMIT_MSG, "json": True, "outcome": "limited"},
+    {"field": "available", "equals": True, "outcome": "avail"},
+    {"field": "available", "equals": False, "outcome": "taken"},
+    {"contains": "unavailable", "outcome": "taken"},
+    {"contains": "taken", "outcome": "taken"},
+    {"contains": "available", "outcome": "avail"},
+)
+
+_MISSING = object()
+
+
+class Classifier:
+    # rules compiled once; a reply is json-parsed at most once and never lowercased
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = []
+        for r in rules:
+            try: out = Outcome[str(r["outcome"]).upper()]
+            except (KeyError, TypeError):
+                raise ValueError(f"Rule needs an outcome of avail/taken/err/limited: {r}") from None
+            if "field" in r:
+                self.rules.append((tuple(str(r["field"]).split(".")), r.get("equals", _MISSING), None, out, True))
+            elif "contains" in r or "regex" in r:
+                try: rx = re.compile(r["regex"] if "regex" in r else re.escape(r["contains"]), re.I)
+                except re.error as exc: raise ValueError(f"Bad rule regex {r['regex']!r}: {exc}") from None
+                self.rules.append((None, None, rx, out, bool(r.get("json"))))
+            else:
+                raise ValueError(f"Rule needs field, contains or regex: {r}")
+        self._json = any(rx is None for _, _, rx, _, _ in self.rules)
+
+    def __call__(self, resp):
+        # a json reply gets field rules and "json" text rules only; truncated
+        # json can still hit the latter (a rate limit), otherwise it is an error
+        data = _MISSING
+        obj = resp[:1] == "{"
+        if obj and self._json:
+            try: data = json.loads(resp)
+            except ValueError: pass
+        for path, want, rx, out, in_json in self.rules:
+            if rx is not None:
+                if (in_json or not obj) and rx.search(resp): return out
+                continue
+            v = data
+            for k in path: v = v.get(k, _MISSING) if isinstance(v, dict) else _MISSING
+            if v is not _MISSING and (want is _MISSING or (v == want and type(v) is type(want))):
+                return out
+        return Outcome.ERR
+
+
+def load_rules(path=RULES_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f: rules = json.load(f)
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"Can't read rules from {path}: {exc}") from None
+    if not isinstance(rules, list) or not all(isinstance(r, dict) for r in rules):
+        raise ValueError(f"{path} must hold a list of rule objects")
+    return Classifier(rules)
+
+
+classify = Classifier()
+
+
+def timeout_kind(exc):
+    # requests: ConnectTimeout / ReadTimeout, older aiohttp only says so in the message
+    conn = "connect" in type(exc).__name__.lower() or str(exc).lower().startswith("connection timeout")
+    return "connect" if conn else "read"
+
+
+def timeout_msg(exc, budget):
+    return f"timed out ({timeout_kind(exc)}, budget {budget[0]:g}s / {budget[1]:g}s)"
+
+
+def retry_after(headers):
+    v = headers.get("Retry-After") if headers else None
+    if not v: return None
+    try: return max(0.0, float(v))
+    except ValueError: pass
+    try: return max(0.0, (parsedate_to_datetime(v) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError): return None
+
+
+class RateLimiter:
+    # shared permit scheduler for all workers. Unpaced until the first limit,
+    # then AIMD: a limit halves the rate and pauses everyone for the cooldown,
+    # clean time ramps the rate back up linearly
+    def __init__(self, cooldown=RL_COOLDOWN, min_rate=RL_MIN_RATE, ramp=RL_RAMP, max_rate=None,
+            lock=None):
+        self.cooldown = cooldown
+        self.min_rate, self.max_rate = min_rate, max_rate
+        self.ramp = ramp
+        self.rate = None
+        self.hits = 0
+        self._lock = lock or threading.Lock()
+        self._next = 0.0      # earliest slot for the next permit
+        self._resume = 0.0    # end of the current global cooldown
+        self._ramped = 0.0
+        self._recent = deque()  # permit times, to measure the rate that got limited
+
+    def _reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            if self.rate and now > self._resume:
+                self.rate += self.ramp * (now - max(self._ramped, self._resume))
+                if self.max_rate: self.rate = min(self.rate, self.max_rate)
+            self._ramped = now
+            t = max(now, self._resume, self._next)
+            if self.rate: self._next = t + 1.0 / self.rate
+            self._recent.append(t)
+            while self._recent[0] < now - 5.0: self._recent.popleft()
+            return t - now
+
+    def acquire(self, stop=None):
+        # blocks until the permit slot; False if stop was set meanwhile.
+        # a cooldown that started while we slept voids the slot
+        while True:
+            wait = self._reserve()
+            if wait <= 0: return True
+            if stop is None: time.sleep(wait)
+            elif stop.wait(wait): return False
+            if time.monotonic() >= self._resume: return True
+
+    async def acquire_async(self, stop=None):
+        # same as acquire(), stop is an asyncio.Event
+        import asyncio
+        while True:
+            wait = self._reserve()
+            if wait <= 0: return True
+            if stop is None: await asyncio.sleep(wait)
+            else:
+                try:
+                    await asyncio.wait_for(stop.wait(), wait)
+                    return False
+                except asyncio.TimeoutError: pass
+            if time.monotonic() >= self._resume: return True
+
+    def limited(self, retry=None):
+        # returns the new pause in seconds, or None if already backing off
+        with self._lock:
+            self.hits += 1
+            now = time.monotonic()
+            if now < self._resume: return None
+            span = max(now - self._recent[0], 1.0) if self._recent else 1.0
+            base = self.rate or len(self._recent) / span
+            self.rate = max(self.min_rate, base / 2)
+            pause = self.cooldown if retry is None else retry
+            self._resume = self._next = now + pause
+            return pause
+
+
+class AdaptiveTimeout:
+    # per-request (connect, read) budgets from recent good latencies:
+    # connect = mult x p50, read = mult x p99, clamped to [floor, ceiling].
+    # Until `warmup` samples exist the defaults apply. A timeout widens the
+    # budget that fired right away, so a server that got slower is not cut
+    # off by budgets learned while it was fast
+    def __init__(self, ceiling=TIMEOUT_MAX, floor=TIMEOUT_MIN, mult=TIMEOUT_MULT,
+            window=500, warmup=30, every=25):
+        self.ceiling, self.floor, self.mult = ceiling, min(floor, ceiling), mult
+        self.warmup, self.every = warmup, every
+        self.connect = min(TIMEOUT_CONNECT, ceiling)
+        self.read = ceiling
+        self._lat = deque(maxlen=window)
+        self._new = 0
+        self._lock = threading.Lock()
+
+    @property
+    def budget(self):
+        return self.connect, self.read
+
+    @property
+    def full(self):
+        return self.ceiling, self.ceiling
+
+    def _clamp(self, v):
+        return round(min(self.ceiling, max(self.floor, v)), 3)
+
+    def observe(self, latency):
+        # full request time of a response that arrived, timeouts excluded
+        with self._lock:
+            self._lat.append(latency)
+            self._new += 1
+            if self._new < self.every or len(self._lat) < self.warmup: return
+            self._new = 0
+            lat = sorted(self._lat)
+        p50, p99 = lat[len(lat) // 2], lat[min(len(lat) - 1, int(len(lat) * 0.99))]
+        self.connect, self.read = self._clamp(self.mult * p50), self._clamp(self.mult * p99)
+
+    def timed_out(self, kind, budget):
+        # widen from the budget that was used, not the current one, so a burst
+        # of concurrent timeouts doubles it once. The next recompute narrows it
+        # again unless slow replies keep coming
+        with self._lock:
+            if kind == "connect": self.connect = max(self.connect, self._clamp(budget[0] * TIMEOUT_BACKOFF))
+            else: self.read = max(self.read, self._clamp(budget[1] * TIMEOUT_BACKOFF))
+
+
+class SessionPool:
+    # one keep-alive session per proxy route, reused by every worker for the whole run
+    def __init__(self, headers=None, pool_size=10):
+        import requests  # deferred, keeps headless startup fast
+        from requests.adapters import HTTPAdapter
+        self._session, self._adapter = requests.Session, HTTPAdapter
+        self.headers = dict(headers or {})
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, proxy=None):
+        key = proxy.get("http", "") if proxy else ""
+        s = self._sessions.get(key)
+        if s is not None: return s
+        with self._lock:
+            s = self._sessions.get(key)
+            if s is None:
+                s = self._session()
+                adapter = self._adapter(pool_connections=1, pool_maxsize=self.pool_size)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers.update(self.headers)
+                self._sessions[key] = s
+            return s
+
+    def drop(self, proxy):
+        with self._lock:
+            s = self._sessions.pop(proxy.get("http", ""), None)
+        if s is not None: s.close()
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for s in sessions: s.close()
+
+
+# output
+
+def _row(name, status, resp, latency, ts):
+    ms = None if latency is None else round(latency * 1000, 1)
+    stamp = datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds")
+    return name, status, resp, ms, stamp
+
+
+def emit_rows(f, fmt, items, out=None):
+    # items are (name, status, resp, latency_s, ts); out is the csv writer for csv
+    if fmt == "txt":
+        f.write("".join(f"{name}: {resp}\n" for name, _, resp, _, _ in items))
+    elif fmt == "jsonl":
+        f.write("".join(json.dumps(dict(zip(ResultWriter.FIELDS, _row(*it))), ensure_ascii=False) + "\n"
+            for it in items))
+    else:
+        out.writerows(_row(*it) for it in items)
+    f.flush()
+
+
+class ResultWriter:
+    # owns the output file and the results table on its own thread; workers
+    # only enqueue, so recording a result takes no lock of ours
+    FIELDS = ("name", "status", "response", "latency_ms", "ts")
+
+    def __init__(self, fmt="txt", path=None, interval=OUT_FLUSH_S, batch=OUT_FLUSH_N, cache=None,
+            profiler=None, table=None, on_row=None, on_error=None):
+        self.fmt = fmt
+        self.cache = cache
+        self.table, self.on_row, self.on_error = table, on_row, on_error
+        self.error = None  # first failure; rows from then on may be missing from output or cache
+        self.path = path or OUT_FILES[fmt]
+        self.interval, self.batch = interval, batch
+        self._q = SimpleQueue()
+        run = profiler.thread(self._run, "writer") if profiler else self._run
+        self._t = threading.Thread(target=run, daemon=True)
+        self._t.start()
+
+    def write(self, name, status, resp, latency=None):
+        self._q.put((name, status, resp, latency, time.time()))
+
+    def flush(self, wait=True):
+        done = threading.Event()
+        self._q.put(done)
+        if wait: done.wait(5)
+
+    def close(self):
+        if self._t.is_alive():
+            self._q.put(None)
+            self._t.join(5)
+
+    def _fail(self, what, exc):
+        # the thread keeps draining either way, so workers and flush() never hang
+        if self.error is None:
+            self.error = f"{what}: {exc}"
+            if self.on_error: self.on_error(self.error)
+
+    def _emit(self, f, out, buf):
+        # rows that never reached the output stay out of the cache, a resume rechecks them
+        if f is None: return
+        try: emit_rows(f, self.fmt, buf, out)
+        except Exception as exc: return self._fail(f"writing {self.path}", exc)
+        if self.cache:
+            try: self.cache.put_many(buf)
+            except Exception as exc: self._fail("result cache", exc)
+
+    def _run(self):
+        f = out = None
+        try:
+            fresh = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            f = open(self.path, "a", encoding="utf-8", newline="")
+            out = csv.writer(f) if self.fmt == "csv" else None
+            if out and fresh: out.writerow(self.FIELDS)
+        except OSError as exc:
+            self._fail(f"opening {self.path}", exc)
+        try:
+            self._drain(f, out)
+        finally:
+            if f: f.close()
+
+    def _drain(self, f, out):
+        buf, last = [], time.monotonic()
+        while True:
+            try: item = self._q.get(timeout=max(0.0, self.interval - (time.monotonic() - last)))
+            except Empty: item = False  # interval elapsed
+            if isinstance(item, tuple):
+                buf.append(item)
+                if self.table is not None:
+                    try:
+                        row = self.table.append(item[0], STATUS[item[1]], *item[2:])
+                        if self.on_row: self.on_row(row)
+                    except Exception as exc:
+                        self._fail("results table", exc)
+                if len(buf) < self.batch and time.monotonic() - last < self.interval: continue
+            if buf: self._emit(f, out, buf)
+            buf, last = [], time.monotonic()
+            if isinstance(item, threading.Event): item.set()
+            elif item is None: break
+
+
+class Status(IntEnum):
+    AVAIL = 0
+    TAKEN = 1
+    ERR = 2
 
-class App(ctk.CTk):
+    @property
+    def tag(self):
+        return ("avail", "taken", "err")[self]
+
+    @property
+    def label(self):
+        return ("available", "taken", "error")[self]
+
+
+STATUS = {s.tag: s for s in Status}
+
+
+class ResultTable:
+    # every result of the run in flat arrays: one status byte per row, names
+    # packed into a single utf-8 blob, latency and time as float32, and the
+    # raw response only for errors. Only the ResultWriter thread appends;
+    # readers on other threads only touch rows below len(), which are complete
     def __init__(self):
-        super().__init__()
-        self.title("Dark Matter - ai.com Checker")
-        self.geometry("720x960")
-        self.configure(fg_color=BG)
-        self.resizable(False, False)
+        self.t0 = time.time()
+        self._blob = bytearray()
+        self._off = array("Q", [0])
+        self.latency = array("f")   # ms, nan when no request got through
+        self.ts = array("f")        # seconds since t0
+        self.errors = {}            # row -> raw response
+        self._index = {s: array("I") for s in Status}
+        self.status = array("B")
+
+    def __len__(self):
+        return len(self.status)
+
+    def append(self, name, status, resp=None, latency=None, ts=None):
+        i = len(self.status)
+        self._blob += name.encode()
+        self._off.append(len(self._blob))
+        self.latency.append(math.nan if latency is None else latency * 1000)
+        self.ts.append((ts or time.time()) - self.t0)
+        if status is Status.ERR: self.errors[i] = resp
+        self.status.append(status)  # the row counts once it is complete...
+        self._index[status].append(i)  # ...and only then shows up in rows(status) / tail(status)
+        return i
+
+    def count(self, status=None):
+        return len(self.status) if status is None else len(self._index[status])
+
+    def rows(self, status=None):
+        # row numbers, oldest first
+        return range(len(self.status)) if status is None else self._index[status][:]
+
+    def tail(self, status=None, n=1):
+        if status is None: return range(max(0, len(self.status) - n), len(self.status))
+        return self._index[status][-n:]
+
+    def name(self, i):
+        return self._blob[self._off[i]:self._off[i + 1]].decode()
+
+    def resp(self, i):
+        return self.errors.get(i) or Status(self.status[i]).label
+
+    def row(self, i):
+        # same shape ResultWriter writes: (name, tag, resp, latency_s, ts)
+        lat = self.latency[i]
+        return (self.name(i), Status(self.status[i]).tag, self.resp(i),
+            None if math.isnan(lat) else lat / 1000, self.t0 + self.ts[i])
+
+    def names(self, status=Status.AVAIL):
+        return [self.name(i) for i in self._index[status]]
+
+    def line(self, i):
+        return f" {ICONS[Status(self.status[i]).tag]} {self.name(i)}: {self.resp(i)}"
+
+    def export(self, path, fmt="txt", status=None, chunk=OUT_FLUSH_N):
+        rows = self.rows(status)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            out = csv.writer(f) if fmt == "csv" else None
+            if out: out.writerow(ResultWriter.FIELDS)
+            for k in range(0, len(rows), chunk):
+                emit_rows(f, fmt, [self.row(i) for i in rows[k:k + chunk]], out)
+        return len(rows)
+
+
+def norm_name(name):
+    return name.strip().lower()
+
+
+class BloomFilter:
+    # fixed-memory dedup for huge name files; a unique name is wrongly seen
+    # as a duplicate with probability ~error
+    def __init__(self, capacity, error=1e-6):
+        self.m = max(64, int(-capacity * math.log(error) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def _idx(self, key):
+        h = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        a, b = int.from_bytes(h[:8], "little"), int.from_bytes(h[8:], "little") | 1
+        return [(a + i * b) % self.m for i in range(self.k)]
+
+    def __contains__(self, key):
+        return all(self.bits[i >> 3] & (1 << (i & 7)) for i in self._idx(key))
+
+    def add(self, key):
+        for i in self._idx(key): self.bits[i >> 3] |= 1 << (i & 7)
+
+
+def unique_names(lines, seen):
+    # length filter + normalized dedup, one line at a time
+    for line in lines:
+        n = line.strip()
+        if len(n) < MIN_LEN: continue
+        k = norm_name(n)
+        if k in seen: continue
+        seen.add(k)
+        yield n
+
+
+def shard_of(name, shards):
+    # stable across processes and runs, unlike hash()
+    return zlib.crc32(norm_name(name).encode()) % shards
+
+
+def count_lines(path, chunk=1 << 20):
+    n = 0
+    with open(path, "rb") as f:
+        while block := f.read(chunk): n += block.count(b"\n")
+    return n
+
+
+class ResultCache:
+    # last result per normalized name plus run bookkeeping. A run that never
+    # finished (stop, crash) is resumed: whatever it already checked is skipped.
+    # Runs are scoped so each shard of a sharded run resumes on its own
+    FRESH = ("avail", "taken")  # errors are always rechecked
+
+    def __init__(self, path=CACHE_FILE):
+        # shard processes share the file, so wait out each other's write locks
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.run_id = None
+        self.resumed = False
+        self.cutoff = None
+        self.skipped = 0
+        with self._lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS results (name TEXT PRIMARY KEY, "
+                "status TEXT, response TEXT, checked_at REAL)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, "
+                "started REAL, finished REAL, scope TEXT NOT NULL DEFAULT '')")
+            if "scope" not in {c[1] for c in self.db.execute("PRAGMA table_info(runs)")}:
+                self.db.execute("ALTER TABLE runs ADD COLUMN scope TEXT NOT NULL DEFAULT ''")
+
+    def begin_run(self, ttl_h=0.0, scope=""):
+        now = time.time()
+        with self._lock, self.db:
+            row = self.db.execute("SELECT id, started FROM runs WHERE finished IS NULL AND scope = ? "
+                "ORDER BY id DESC LIMIT 1", (scope,)).fetchone()
+            if row:
+                self.run_id, started = row
+                self.resumed = True
+            else:
+                self.run_id = self.db.execute("INSERT INTO runs (started, scope) VALUES (?, ?)",
+                    (now, scope)).lastrowid
+                started = now
+                self.resumed = False
+        cutoff = now - ttl_h * 3600 if ttl_h > 0 else None
+        if self.resumed: cutoff = started if cutoff is None else min(cutoff, started)
+        self.cutoff = cutoff
+        return self.resumed
+
+    def stale(self, names, chunk=500):
+        # names without a fresh enough result, input order kept
+        if self.cutoff is None: return list(names)
+        out = []
+        for i in range(0, len(names), chunk):
+            part = names[i:i+chunk]
+            keys = [norm_name(n) for n in part]
+            with self._lock:
+                fresh = {k for (k,) in self.db.execute(
+                    f"SELECT name FROM results WHERE name IN ({','.join('?' * len(keys))}) "
+                    f"AND checked_at >= ? AND status IN ({','.join('?' * len(self.FRESH))})",
+                    (*keys, self.cutoff, *self.FRESH))}
+            out += [n for n, k in zip(part, keys) if k not in fresh]
+        return out
+
+    def filter(self, names, chunk=500):
+        # streaming stale(): yields as each chunk is looked up, counts skips
+        self.skipped = 0
+        buf = []
+        for n in names:
+            buf.append(n)
+            if len(buf) < chunk: continue
+            todo = self.stale(buf)
+            self.skipped += len(buf) - len(todo)
+            yield from todo
+            buf = []
+        if buf:
+            todo = self.stale(buf)
+            self.skipped += len(buf) - len(todo)
+            yield from todo
+
+    def put_many(self, items):
+        rows = [(norm_name(name), status, resp, ts) for name, status, resp, _, ts in items]
+        with self._lock, self.db:
+            self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", rows)
+
+    def end_run(self, completed):
+        if not completed or self.run_id is None: return
+        with self._lock, self.db:
+            self.db.execute("UPDATE runs SET finished = ? WHERE id = ?", (time.time(), self.run_id))
+
+    def close(self):
+        with self._lock: self.db.close()
+
+
+# metrics
+
+class _MetricShard:
+    # one thread's share of the metrics, written only by that thread
+    __slots__ = ("counts", "n", "sum_ms", "max_ms", "retries", "limits", "timeouts", "secs", "done")
+
+    def __init__(self, buckets, window):
+        self.counts = [0] * (buckets + 1)
+        self.n = self.retries = self.limits = self.timeouts = 0
+        self.sum_ms = self.max_ms = 0.0
+        self.secs = [-1] * window  # ring of per-second completion counts
+        self.done = [0] * window
+
+
+class Metrics:
+    # live run figures: request latency histogram, sliding-window rate and
+    # retry / rate-limit / timeout counters. Each thread updates its own shard
+    # without locking; readers (ui refresh, snapshots) merge the shards
+    BUCKETS = (5, 10, 25, 50, 75, 100, 150, 200, 300, 500, 750,
+        1000, 1500, 2000, 3000, 5000, 7500, 10000, 15000)  # upper bounds, ms
+
+    def __init__(self, window=RATE_WINDOW):
+        self.window = window
+        self.started = time.monotonic()
+        self._shards = []
+        self._local = threading.local()
+        self._lock = threading.Lock()  # shard registration only
+
+    def _shard(self):
+        s = getattr(self._local, "shard", None)
+        if s is None:
+            s = self._local.shard = _MetricShard(len(self.BUCKETS), self.window)
+            with self._lock: self._shards = [*self._shards, s]
+        return s
+
+    def observe(self, latency=None):
+        # one finished name; latency in seconds if a request got that far
+        s = self._shard()
+        if latency is not None:
+            ms = latency * 1000
+            s.counts[bisect_left(self.BUCKETS, ms)] += 1
+            s.n += 1
+            s.sum_ms += ms
+            if ms > s.max_ms: s.max_ms = ms
+        sec = int(time.monotonic())
+        slot = sec % self.window
+        if s.secs[slot] != sec:
+            s.secs[slot], s.done[slot] = sec, 0
+        s.done[slot] += 1
+
+    def count(self, key, n=1):
+        s = self._shard()
+        setattr(s, key, getattr(s, key) + n)
+
+    def _sum(self, key):
+        return sum(getattr(s, key) for s in self._shards)
+
+    @property
+    def n(self):
+        return self._sum("n")
+
+    @property
+    def sum_ms(self):
+        return self._sum("sum_ms")
+
+    @property
+    def retries(self):
+        return self._sum("retries")
+
+    @property
+    def limits(self):
+        return self._sum("limits")
+
+    @property
+    def timeouts(self):
+        return self._sum("timeouts")
+
+    @property
+    def max_ms(self):
+        return max((s.max_ms for s in self._shards), default=0.0)
+
+    @property
+    def counts(self):
+        return [sum(c) for c in zip(*(s.counts for s in self._shards))] or [0] * (len(self.BUCKETS) + 1)
+
+    def rate(self):
+        # completions/s over the last `window` seconds
+        now = time.monotonic()
+        first = int(now) - self.window + 1
+        done = sum(d for s in self._shards for sec, d in zip(s.secs, s.done) if sec >= first)
+        span = min(now - first, now - self.started)
+        return done / max(span, 1.0)
+
+    def percentile(self, p):
+        # interpolated inside the bucket, so as coarse as BUCKETS
+        counts = self.counts
+        n, top = sum(counts), self.max_ms
+        if not n: return None
+        rank, seen = p / 100 * n, 0
+        for i, c in enumerate(counts):
+            if c and seen + c >= rank:
+                if i == len(self.BUCKETS): return top
+                lo = self.BUCKETS[i - 1] if i else 0
+                return min(lo + (self.BUCKETS[i] - lo) * (rank - seen) / c, top)
+            seen += c
+        return top
+
+    def eta(self, remaining):
+        rate = self.rate()
+        return remaining / rate if rate > 0 and remaining >= 0 else None
+
+
+def prometheus_text(snap, prefix="dm"):
+    lines = []
+
+    def metric(name, kind, help, samples):
+        lines.append(f"# HELP {prefix}_{name} {help}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, v in samples:
+            v = "NaN" if v is None else v
+            lines.append(f"{prefix}_{name}{labels} {v}")
+
+    metric("checked_total", "counter", "Names checked.", [("", snap["checked"])])
+    metric("results_total", "counter", "Results by status.",
+        [(f'{{status="{k}"}}', snap[k]) for k in ("avail", "taken", "errs")])
+    metric("names", "gauge", "Names queued so far.", [("", snap["total"])])
+    metric("retries_total", "counter", "Extra attempts (rate limits, dead proxies, timeouts).",
+        [("", snap["retries"])])
+    metric("rate_limits_total", "counter", "Rate-limited responses.", [("", snap["rate_limits"])])
+    metric("timeouts_total", "counter", "Timed out requests.", [("", snap["timeouts"])])
+    metric("rate", "gauge", f"Names/s over the last {RATE_WINDOW}s.", [("", snap["rate"])])
+    metric("eta_seconds", "gauge", "Estimated time left.", [("", snap["eta_s"])])
+    metric("elapsed_seconds", "gauge", "Run time.", [("", snap["elapsed_s"])])
+    metric("latency_quantile_seconds", "gauge", "Request latency percentiles.",
+        [(f'{{quantile="{q}"}}', None if snap[k] is None else snap[k] / 1000)
+            for q, k in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms"))])
+    hist, cum = [], 0
+    for le, c in zip([*Metrics.BUCKETS, None], snap["latency_buckets"]):
+        cum += c
+        hist.append((f'_bucket{{le="{"+Inf" if le is None else le / 1000}"}}', cum))
+    hist += [("_sum", round(snap["latency_sum_ms"] / 1000, 6)), ("_count", cum)]
+    metric("request_latency_seconds", "histogram", "Request latency.", hist)
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    # rewrites a snapshot file every interval (json, or prometheus text format
+    # for a node_exporter textfile collector), atomically via rename
+    def __init__(self, snapshot, path=None, fmt="json", interval=METRICS_S, on_error=None):
+        self.snapshot = snapshot
+        self.fmt = fmt
+        self.path = path or METRICS_FILES[fmt]
+        self.interval = interval
+        self.on_error = on_error
+        self.error = None  # first failed write; later ones keep retrying quietly
+        self._stop = threading.Event()
+        self._t = threading.Thread(target=self._run, daemon=True)
+        self._t.start()
+
+    def dump(self):
+        snap = self.snapshot()
+        text = prometheus_text(snap) if self.fmt == "prom" else json.dumps(snap, indent=2) + "\n"
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f: f.write(text)
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            if self.error is None:
+                self.error = str(exc)
+                if self.on_error: self.on_error(self.error)
+
+    def close(self):
+        # one last snapshot with the final figures
+        self._stop.set()
+        self._t.join(5)
+        self.dump()
+
+    def _run(self):
+        while not self._stop.wait(self.interval): self.dump()
+
+
+# profiling
+
+class TimedLock:
+    # drop-in Lock that books how long each acquire waited
+    def __init__(self, profiler, name):
+        self._lock = threading.Lock()
+        self._prof, self._name = profiler, name
+
+    def acquire(self, blocking=True, timeout=-1):
+        t = time.perf_counter()
+        ok = self._lock.acquire(blocking, timeout)
+        self._prof.add_time(self._name, time.perf_counter() - t)
+        return ok
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class Profiler:
+    # opt-in run profiling: one cProfile per thread grouped by role, a
+    # tracemalloc diff over the run and wall-time stats for named spans
+    # (ui callbacks, lock waits). Timings are kept per thread, so timing
+    # a lock doesn't add a shared lock of its own
+    def __init__(self, top=30):
+        self.top = top
+        self.elapsed = 0.0
+        self.peak = None
+        self._profiles = []   # (role, cProfile.Profile)
+        self._timings = []    # one {name: [calls, total, max]} per thread
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._mem0 = self._mem1 = None
+        self._t0 = 0.0
+
+    def start(self):
+        import tracemalloc
+        self._t0 = time.perf_counter()
+        if not tracemalloc.is_tracing(): tracemalloc.start()
+        self._mem0 = tracemalloc.take_snapshot()
+        return self
+
+    def stop(self):
+        import tracemalloc
+        self.elapsed = time.perf_counter() - self._t0
+        if tracemalloc.is_tracing():
+            self._mem1 = tracemalloc.take_snapshot()
+            self.peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def attach(self, role):
+        # profiles the calling thread until .disable(); None if it is
+        # already covered (3.12+ runs a single process-wide profiler)
+        import cProfile
+        p = cProfile.Profile()
+        try: p.enable()
+        except ValueError: return None
+        with self._lock: self._profiles.append((role, p))
+        return p
+
+    def thread(self, fn, role):
+        def run(*a, **kw):
+            p = self.attach(role)
+            try: return fn(*a, **kw)
+            finally:
+                if p: p.disable()
+        return run
+
+    def add_time(self, name, secs):
+        t = getattr(self._local, "t", None)
+        if t is None:
+            t = self._local.t = {}
+            with self._lock: self._timings.append(t)
+        s = t.get(name)
+        if s is None: t[name] = [1, secs, secs]
+        else:
+            s[0] += 1
+            s[1] += secs
+            if secs > s[2]: s[2] = secs
+
+    @contextmanager
+    def span(self, name):
+        t = time.perf_counter()
+        try: yield
+        finally: self.add_time(name, time.perf_counter() - t)
+
+    def lock(self, name):
+        return TimedLock(self, name)
+
+    def timings(self):
+        out = {}
+        with self._lock: tables = [dict(t) for t in self._timings]
+        for t in tables:
+            for name, (n, total, mx) in t.items():
+                s = out.setdefault(name, [0, 0.0, 0.0])
+                s[0] += n
+                s[1] += total
+                s[2] = max(s[2], mx)
+        return out
+
+    def report(self):
+        import pstats
+        buf = io.StringIO()
+        w = lambda line="": buf.write(line + "\n")
+        w(f"profile report, {self.elapsed:.1f}s wall")
+
+        for title, pick in (("main loop / spans", lambda n: not n.startswith("lock.")),
+                ("lock waits", lambda n: n.startswith("lock."))):
+            rows = sorted(((n, s) for n, s in self.timings().items() if pick(n)),
+                key=lambda r: -r[1][1])
+            w(f"\n== {title} ==")
+            if not rows:
+                w("  (none)")
+                continue
+            w(f"  {'name':<28}{'calls':>9}{'total ms':>11}{'mean ms':>10}{'max ms':>9}")
+            for name, (n, total, mx) in rows:
+                w(f"  {name:<28}{n:>9}{total * 1000:>11.1f}{total / n * 1000:>10.3f}{mx * 1000:>9.1f}")
+
+        with self._lock: profiles = list(self._profiles)
+        for role in dict.fromkeys(r for r, _ in profiles):
+            group = [p for r, p in profiles if r == role]
+            w(f"\n== cProfile: {role} ({len(group)} thread{'s' * (len(group) > 1)}) ==")
+            st = pstats.Stats(*group, stream=buf)
+            st.strip_dirs().sort_stats("cumulative").print_stats(self.top)
+
+        if self._mem1 is not None:
+            w(f"== memory (tracemalloc), peak {self.peak / (1 << 20):.1f} MB ==")
+            import tracemalloc
+            skip = [tracemalloc.Filter(False, f"<frozen importlib.{m}>")
+                for m in ("_bootstrap", "_bootstrap_external")]  # lazy imports
+            diff = self._mem1.filter_traces(skip).compare_to(self._mem0.filter_traces(skip), "lineno")
+            for d in diff[:15]:
+                w(f"  {d}")
+        return buf.getvalue()
+
+    def dump(self, path=PROFILE_FILE):
+        with open(path, "w", encoding="utf-8") as f: f.write(self.report())
+        return path
+
+
+# check engine
+
+class CheckEngine:
+    # the whole pipeline without any ui: feed -> check -> classify -> record.
+    # results go to self.results, counters read from it; on_log(text, tag)
+    # gets status lines, on_result(row) every result, on_done(engine) fires
+    # once, all from run threads
+    def __init__(self, token, names=None, path=None, threads=10, engine="threads",
+            proxies=None, out_fmt="txt", out_path=None, ttl=0.0, cache_path=CACHE_FILE,
+            url=CHECK_URL, timeout=TIMEOUT_MAX, metrics_path=None, metrics_fmt=None, profiler=None,
+            rules=None, shard=None, on_log=None, on_result=None, on_done=None):
+        token = (token or "").strip()
+        if not token:
+            raise ValueError("Enter your token first")
+        if path is None and not any(len(n.strip()) >= MIN_LEN for n in names or ()):
+            raise ValueError(f"Add botnames (min {MIN_LEN} chars each)")
+        if path is not None and not os.path.isfile(path):
+            raise ValueError(f"Names file not found: {path}")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if engine == "async" and importlib.util.find_spec("aiohttp") is None:
+            raise ValueError("Async engine needs aiohttp (pip install aiohttp)")
+        proxies = list(proxies or ())
+        if engine == "async" and any(p["http"].startswith("socks") for p in proxies):
+            raise ValueError("SOCKS5 proxies need the threads engine")
+        if out_fmt not in OUT_FILES:
+            raise ValueError(f"Unknown output format: {out_fmt}")
+        if not timeout or timeout <= 0:
+            raise ValueError("Timeout must be positive")
+        if rules is None and os.path.isfile(RULES_FILE): rules = RULES_FILE
+        self.classify = load_rules(rules) if rules else classify
+        if metrics_fmt is None and metrics_path:
+            metrics_fmt = "prom" if metrics_path.endswith(".prom") else "json"
+        if metrics_fmt is not None and metrics_fmt not in METRICS_FILES:
+            raise ValueError(f"Unknown metrics format: {metrics_fmt}")
+
+        cap = MAX_INFLIGHT if engine == "async" else MAX_THREADS
+        self.threads = max(1, min(cap, int(threads)))
+        self.engine = engine
+        self.url = url
+        self.timeout_max = float(timeout)
+        self.names, self.path = names, path
+        self.shard = shard  # (index, count): only check names that hash to this shard
+        self.headers = {"Content-Type": "application/json", "Cookie": f"token={token};"}
+        self.cycler = ProxyCycler(proxies)
+        self.proxy_kind = proxies[0]["http"].split("://")[0] if proxies else None
+        self.out_fmt, self.out_path = out_fmt, out_path
+        self.ttl, self.cache_path = ttl, cache_path
+        self.metrics_path, self.metrics_fmt = metrics_path, metrics_fmt
+        self.profiler = profiler
+        self.on_log, self.on_result, self.on_done = on_log, on_result, on_done
 
-        self.running = False
         self.stop_flag = threading.Event()
-        self.lock = threading.Lock()
-        self.checked = 0
-        self.avail = 0
-        self.taken = 0
-        self.errs = 0
+        self.done = threading.Event()
+        self.results = ResultTable()
         self.total = 0
-        self.t0 = 0.0
-        self.show_tok = False
-
-        self.setup_ui()
-        self.protocol("WM_DELETE_WINDOW", self.on_close)
-
-    def setup_ui(self):
-        ParticleCanvas(self, w=720, h=110, n=50).pack(fill="x")
-
-        main = ctk.CTkFrame(self, fg_color=BG, corner_radius=0)
-        main.pack(fill="both", expand=True, padx=24, pady=(12, 24))
-
-        # token
-        tf = self.make_card(main)
-        self.section_lbl(tf, "TOKEN")
-        row = ctk.CTkFrame(tf, fg_color="transparent")
-        row.pack(fill="x", padx=16, pady=(0, 12))
-
-        self.tok_entry = ctk.CTkEntry(row, placeholder_text="Paste your ai.com token...",
-            fg_color=CARD, border_color=BORDER, border_width=1, text_color=TEXT,
-            placeholder_text_color=TEXT_MUTED, font=("Consolas", 13), height=38, show="\u2022")
-        self.tok_entry.pack(side="left", fill="x", expand=True, padx=(0, 8))
-
-        ctk.CTkButton(row, text="\U0001f441", width=38, height=38, fg_color=CARD,
-            hover_color=ACCENT_DIM, border_width=1, border_color=BORDER,
-            font=("Segoe UI", 14), command=self.toggle_tok).pack(side="right")
-
-        # botnames
-        nf = self.make_card(main)
-        hdr = ctk.CTkFrame(nf, fg_color="transparent")
-        hdr.pack(fill="x", padx=16, pady=(12, 4))
-        ctk.CTkLabel(hdr, text="BOTNAMES", font=("Segoe UI", 11, "bold"),
-            text_color=TEXT_DIM).pack(side="left")
-        ctk.CTkButton(hdr, text="Load File", width=90, height=28, fg_color=ACCENT_DIM,
-            hover_color=ACCENT, text_color=TEXT, font=("Segoe UI", 11),
-            corner_radius=6, command=self.load_names).pack(side="right")
-
-        self.names_box = ctk.CTkTextbox(nf, height=100, fg_color=CARD, border_color=BORDER,
-            border_width=1, text_color=TEXT, font=("Consolas", 12), corner_radius=8)
-        self.names_box.pack(fill="x", padx=16, pady=(4, 12))
-
-        # proxies
-        pf = self.make_card(main)
-        phdr = ctk.CTkFrame(pf, fg_color="transparent")
-        phdr.pack(fill="x", padx=16, pady=(12, 4))
-        ctk.CTkLabel(phdr, text="PROXIES", font=("Segoe UI", 11, "bold"),
-            text_color=TEXT_DIM).pack(side="left")
-
-        self.proxy_type = ctk.StringVar(value="http")
-        ctk.CTkSegmentedButton(phdr, values=["http", "socks5"], variable=self.proxy_type,
-            font=("Segoe UI", 10), height=26, fg_color=CARD, selected_color=ACCENT,
-            selected_hover_color=ACCENT_HVR, unselected_color=CARD,
-            unselected_hover_color=ACCENT_DIM, text_color=TEXT).pack(side="right", padx=(8, 0))
-
-        ctk.CTkButton(phdr, text="Load File", width=90, height=28, fg_color=ACCENT_DIM,
-            hover_color=ACCENT, text_color=TEXT, font=("Segoe UI", 11),
-            corner_radius=6, command=self.load_proxies).pack(side="right")
-
-        self.proxy_box = ctk.CTkTextbox(pf, height=70, fg_color=CARD, border_color=BORDER,
-            border_width=1, text_color=TEXT, font=("Consolas", 11), corner_radius=8)
-        self.proxy_box.pack(fill="x", padx=16, pady=(4, 4))
-        ctk.CTkLabel(pf, text="ip:port  /  user:pass@ip:port  /  leave empty for direct",
-            font=("Segoe UI", 9), text_color=TEXT_MUTED).pack(anchor="w", padx=16, pady=(0, 10))
-
-        # controls
-        ctrl = ctk.CTkFrame(main, fg_color="transparent")
-        ctrl.pack(fill="x", pady=(0, 10))
-
-        left = ctk.CTkFrame(ctrl, fg_color=SURFACE, corner_radius=10,
-            border_width=1, border_color=BORDER)
-        left.pack(side="left")
-        ctk.CTkLabel(left, text="Threads", font=("Segoe UI", 11),
-            text_color=TEXT_DIM).pack(side="left", padx=(12, 6), pady=8)
-        self.thr_var = ctk.StringVar(value="10")
-        ctk.CTkEntry(left, textvariable=self.thr_var, width=48, height=30, fg_color=CARD,
-            border_color=BORDER, border_width=1, text_color=TEXT, font=("Consolas", 13),
-            justify="center").pack(side="left", padx=(0, 12), pady=8)
-
-        self.stop_btn = ctk.CTkButton(ctrl, text="\u23f9  STOP", width=120, height=42,
-            fg_color="#7f1d1d", hover_color=RED, text_color=TEXT,
-            font=("Segoe UI", 13, "bold"), corner_radius=10,
-            command=self.do_stop, state="disabled")
-        self.stop_btn.pack(side="right", padx=(8, 0))
-
-        self.start_btn = ctk.CTkButton(ctrl, text="\u25b6  START", width=120, height=42,
-            fg_color=ACCENT, hover_color=ACCENT_HVR, text_color="white",
-            font=("Segoe UI", 13, "bold"), corner_radius=10, command=self.do_start)
-        self.start_btn.pack(side="right")
-
-        # progress
-        prf = self.make_card(main, pad_bot=10)
-        pri = ctk.CTkFrame(prf, fg_color="transparent")
-        pri.pack(fill="x", padx=16, pady=12)
-
-        self.prog_lbl = ctk.CTkLabel(pri, text="Ready", font=("Segoe UI", 12), text_color=TEXT_DIM)
-        self.prog_lbl.pack(anchor="w")
-
-        self.pbar = ctk.CTkProgressBar(pri, height=14, corner_radius=7,
-            fg_color=CARD, progress_color=ACCENT, border_width=0)
-        self.pbar.pack(fill="x", pady=(6, 10))
-        self.pbar.set(0)
-
-        stats = ctk.CTkFrame(pri, fg_color="transparent")
-        stats.pack(fill="x")
-        self.s_avail = self.make_stat(stats, "Available", GREEN)
-        self.s_taken = self.make_stat(stats, "Taken", RED)
-        self.s_errs = self.make_stat(stats, "Errors", AMBER)
-        self.s_proxy = self.make_stat(stats, "Proxies", CYAN, "\u2014")
-        self.s_rate = self.make_stat(stats, "Rate", TEXT_DIM, "\u2014")
-
-        # results
-        rf = self.make_card(main, expand=True)
-        self.section_lbl(rf, "RESULTS")
-        self.log = ctk.CTkTextbox(rf, fg_color=CARD, border_color=BORDER, border_width=1,
-            text_color=TEXT, font=("Consolas", 12), corner_radius=8)
-        self.log.pack(fill="both", expand=True, padx=16, pady=(0, 12))
-        self.log.configure(state="disabled")
-
-        for tag, col in [("avail", GREEN), ("taken", RED), ("err", AMBER),
-                         ("rl", AMBER), ("dim", TEXT_DIM), ("proxy", CYAN)]:
-            self.log._textbox.tag_configure(tag, foreground=col)
-
-    # helpers
-
-    def make_card(self, parent, pad_bot=10, expand=False):
-        f = ctk.CTkFrame(parent, fg_color=SURFACE, corner_radius=12,
-            border_width=1, border_color=BORDER)
-        f.pack(fill="both" if expand else "x", expand=expand, pady=(0, pad_bot))
-        return f
-
-    def section_lbl(self, parent, txt):
-        ctk.CTkLabel(parent, text=txt, font=("Segoe UI", 11, "bold"),
-            text_color=TEXT_DIM).pack(anchor="w", padx=16, pady=(12, 4))
-
-    def make_stat(self, parent, label, color, init="0"):
-        f = ctk.CTkFrame(parent, fg_color="transparent")
-        f.pack(side="left", expand=True)
-        v = ctk.CTkLabel(f, text=init, font=("Segoe UI", 18, "bold"), text_color=color)
-        v.pack()
-        ctk.CTkLabel(f, text=label, font=("Segoe UI", 10), text_color=TEXT_MUTED).pack()
-        return v
-
-    def toggle_tok(self):
-        self.show_tok = not self.show_tok
-        self.tok_entry.configure(show="" if self.show_tok else "\u2022")
-
-    def load_names(self):
-        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All", "*.*")])
-        if path:
-            with open(path, "r", encoding="utf-8") as f:
-                self.names_box.delete("1.0", "end")
-                self.names_box.insert("1.0", f.read())
-
-    def load_proxies(self):
-        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All", "*.*")])
-        if path:
-            with open(path, "r", encoding="utf-8") as f:
-                self.proxy_box.delete("1.0", "end")
-                self.proxy_box.insert("1.0", f.read())
-
-    def write_log(self, text, tag):
-        self.log.configure(state="normal")
-        self.log._textbox.insert("end", text + "\n", tag)
-        self.log._textbox.see("end")
-        self.log.configure(state="disabled")
-
-    def update_stats(self, cycler=None):
-        self.s_avail.configure(text=str(self.avail))
-        self.s_taken.configure(text=str(self.taken))
-        self.s_errs.configure(text=str(self.errs))
-        if cycler:
-            a, t = cycler.alive, cycler.total
-            self.s_proxy.configure(text=f"{a}/{t}" if t else "off",
-                text_color=GREEN if a == t else AMBER if a else RED)
-        if self.total > 0:
-            pct = self.checked / self.total
-            self.pbar.set(pct)
-            self.prog_lbl.configure(text=f"Checking...  {self.checked}/{self.total}  ({pct:.0%})")
-        if self.checked > 0:
-            rate = self.checked / max(time.time() - self.t0, 0.01)
-            self.s_rate.configure(text=f"{rate:.1f}/s")
-
-    def flash(self, msg):
-        self.prog_lbl.configure(text=msg, text_color=RED)
-        self.after(3000, lambda: self.prog_lbl.configure(text="Ready", text_color=TEXT_DIM))
-
-    def pulse(self):
-        if not self.running:
-            self.pbar.configure(progress_color=ACCENT)
-            return
-        t = time.time()
-        f = 0.5 + 0.5 * math.sin(t * 3.5)
-        r = int(0x7c + (0xa7 - 0x7c) * f)
-        g = int(0x3a + (0x8b - 0x3a) * f)
-        b = int(0xed + (0xfa - 0xed) * f)
-        self.pbar.configure(progress_color=f"#{r:02x}{g:02x}{b:02x}")
-        self.after(45, self.pulse)
-
-    # main logic
-
-    def do_start(self):
-        token = self.tok_entry.get().strip()
-        if not token:
-            self.flash("Enter your token first")
-            return
-
-        raw = self.names_box.get("1.0", "end").strip()
-        names = [n.strip() for n in raw.splitlines() if len(n.strip()) >= 4]
-        if not names:
-            self.flash("Add botnames (min 4 chars each)")
-            return
-
-        try: n_thr = max(1, min(100, int(self.thr_var.get())))
-        except ValueError: n_thr = 10
-
-        proxy_raw = self.proxy_box.get("1.0", "end").strip()
-        plist = parse_proxies(proxy_raw, self.proxy_type.get())
-        cycler = ProxyCycler(plist)
-
-        self.running = True
-        self.stop_flag.clear()
-        self.checked = self.avail = self.taken = self.errs = 0
-        self.total = len(names)
+        self.active = self.feeding = False
+        self.t0 = self.elapsed = 0.0
+        self.limiter = None
+        self.timeout = None
+        self.writer = None
+        self._wake = None      # set by the running engine, unblocks its waits on stop
+        self._sealed = False   # past the stop drain, late results are dropped
+        self.error = None      # why the run failed to start or broke off, if it did
+        self.metrics = Metrics()
+
+    @property
+    def stopped(self):
+        return self.stop_flag.is_set()
+
+    @property
+    def checked(self):
+        return len(self.results)
+
+    @property
+    def avail(self):
+        return self.results.count(Status.AVAIL)
+
+    @property
+    def taken(self):
+        return self.results.count(Status.TAKEN)
+
+    @property
+    def errs(self):
+        return self.results.count(Status.ERR)
+
+    def start(self):
+        threading.Thread(target=self._profiled(self.run, "engine"), daemon=True).start()
+        return self
+
+    def _profiled(self, fn, role):
+        return self.profiler.thread(fn, role) if self.profiler else fn
+
+    def stop(self):
+        self.stop_flag.set()
+        wake = self._wake
+        if wake: wake()
+        if self.writer: self.writer.flush(wait=False)
+
+    def seal(self):
+        self._sealed = True
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def log(self, text, tag):
+        if self.on_log: self.on_log(text, tag)
+
+    def _exporter(self):
+        if not self.metrics_fmt: return None
+        return MetricsExporter(self.snapshot, self.metrics_path, self.metrics_fmt,
+            on_error=lambda e: self.log(f" \u26a0 Metrics not written: {e}", "err"))
+
+    def eta(self, total=None):
+        # seconds left at the windowed rate; None while the total is unknown
+        if total is None and self.feeding: return None
+        return self.metrics.eta((total or self.total) - self.checked)
+
+    def snapshot(self):
+        m = self.metrics
+        eta = self.eta()
+        pct = {f"p{p}_ms": None if v is None else round(v, 1)
+            for p, v in ((p, m.percentile(p)) for p in (50, 95, 99))}
+        return {"ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "engine": self.engine, "threads": self.threads,
+            "elapsed_s": round(self.elapsed or (time.time() - self.t0 if self.t0 else 0.0), 1),
+            "running": self.active, "feeding": self.feeding,
+            "total": self.total, "checked": self.checked,
+            "avail": self.avail, "taken": self.taken, "errs": self.errs,
+            "rate": round(m.rate(), 2), "eta_s": None if eta is None else round(eta, 1),
+            "retries": m.retries, "rate_limits": m.limits, "timeouts": m.timeouts,
+            "pace": None if not self.limiter or self.limiter.rate is None else round(self.limiter.rate, 2),
+            "timeout_connect_s": self.timeout.connect if self.timeout else None,
+            "timeout_read_s": self.timeout.read if self.timeout else None,
+            **pct, "latency_mean_ms": round(m.sum_ms / m.n, 1) if m.n else None,
+            "latency_sum_ms": round(m.sum_ms, 1), "latency_buckets": list(m.counts)}
+
+    def run(self):
         self.t0 = time.time()
-        self.pbar.set(0)
-        self.log.configure(state="normal")
-        self.log.delete("1.0", "end")
-        self.log.configure(state="disabled")
-        self.start_btn.configure(state="disabled")
-        self.stop_btn.configure(state="normal")
-        self.prog_lbl.configure(text=f"Checking...  0/{self.total}  (0%)", text_color=TEXT_DIM)
-        self.s_rate.configure(text="\u2014")
-        self.s_proxy.configure(
-            text=f"{cycler.total}" if cycler.total else "off",
-            text_color=CYAN if cycler.total else TEXT_MUTED)
-        self.pulse()
-
-        if cycler.total:
-            self.after(0, lambda: self.write_log(
-                f" \u25cb Loaded {cycler.total} proxies ({self.proxy_type.get()}), {n_thr} threads", "proxy"))
+        self.active = self.feeding = True
+        slots = f"{self.threads} in-flight (async)" if self.engine == "async" else f"{self.threads} threads"
+        if self.cycler.total:
+            self.log(f" \u25cb Loaded {self.cycler.total} proxies ({self.proxy_kind}), {slots}", "proxy")
         else:
-            self.after(0, lambda: self.write_log(
-                f" \u25cb Direct mode (no proxies), {n_thr} threads", "dim"))
-
-        q = Queue()
-        for name in names: q.put(name)
+            self.log(f" \u25cb Direct mode (no proxies), {slots}", "dim")
+
+        cache = exporter = None
+        try:
+            cache = ResultCache(self.cache_path)
+            cache.begin_run(self.ttl, scope="%d/%d" % self.shard if self.shard else "")
+            self.limiter = RateLimiter(lock=self.profiler.lock("lock.limiter") if self.profiler else None)
+            self.timeout = AdaptiveTimeout(self.timeout_max)
+            self.writer = ResultWriter(self.out_fmt, self.out_path, cache=cache, profiler=self.profiler,
+                table=self.results, on_row=self.on_result,
+                on_error=lambda e: self.log(f" \u26a0 Results writer failed ({e}); this run stays unfinished "
+                    "so the next one rechecks what was lost", "err"))
+            exporter = self._exporter()
+            names = self.feed(cache)
+            if self.engine == "async":
+                import asyncio
+                asyncio.run(self._run_async(names))
+            else:
+                self._run_threads(names)
+        except (OSError, sqlite3.Error) as exc:
+            # unreadable names file, unwritable cache or output dir: the run
+            # still ends normally below, so waiters and on_done are released
+            self.error = str(exc)
+            self.log(f" \u26a0 Run failed: {exc}", "err")
+        finally:
+            if self.writer: self.writer.close()
+            if cache:
+                ok = self.error is None and self.writer is not None and self.writer.error is None
+                cache.end_run(completed=ok and not self.stopped)
+                cache.close()
+            self.feeding = False
+            self.elapsed = time.time() - self.t0
+            self.active = False
+            try:
+                if exporter: exporter.close()  # final snapshot lands before anyone is told we're done
+            finally:
+                self.done.set()
+                if self.on_done: self.on_done(self)
+
+    def feed(self, cache):
+        # lazily yields names to check: length filter, normalized dedup, cache skips
+        parts = self.shard[1] if self.shard else 1
+        if self.path:
+            seen = BloomFilter(max(100_000, os.path.getsize(self.path) // 6 // parts))
+            src = open(self.path, "r", encoding="utf-8", errors="replace")
+        else:
+            seen, src = set(), iter(self.names)
+        lines = src
+        if self.shard:
+            index = self.shard[0]
+            lines = (n for n in src if shard_of(n, parts) == index)
+        try:
+            for name in cache.filter(unique_names(lines, seen)):
+                self.total += 1
+                yield name
+        finally:
+            if self.path: src.close()
+        self.feeding = False
+        if cache.skipped:
+            why = "already checked by the interrupted run" if cache.resumed else "checked recently"
+            self.log(f" \u25cb Skipped {cache.skipped} names ({why})", "dim")
+
+    def record(self, name, resp, outcome, latency=None):
+        # no lock: metrics are per thread and the writer thread fills self.results
+        if self._sealed: return
+        self.metrics.observe(latency)
+        self.writer.write(name, Status(outcome).tag, resp, latency)
+
+    def rate_limited(self, name, retry):
+        # only the hit that opens a new cooldown is logged, the rest just requeue
+        self.metrics.count("limits")
+        self.metrics.count("retries")
+        pause = self.limiter.limited(retry)
+        if pause is not None:
+            self.log(f" \u23f3 {name}: rate-limited, all workers paused {pause:.0f}s, "
+                f"pacing at {self.limiter.rate:.1f}/s", "rl")
+
+    def _run_threads(self, names):
+        from requests.exceptions import Timeout
+        q = Queue(maxsize=self.threads * 4)
+        pool = SessionPool(self.headers, pool_size=POOL_SIZE or self.threads)
+        cycler, limiter, metrics, tmo = self.cycler, self.limiter, self.metrics, self.timeout
+        verdict = self.classify
+        retries = max(cycler.total, 1) * 2
+        idle = threading.Condition()
+        busy = [self.threads]
 
         def worker():
-            while not q.empty() and not self.stop_flag.is_set():
-                name = q.get()
-                resp, tag = "", "err"
-                retries = max(cycler.total, 1) * 2
-                attempt = 0
-
-                while not self.stop_flag.is_set():
+            try:
+                while (name := q.get()) is not None:
+                    # after a stop whatever is still queued is skipped, a resume rechecks it
+                    if self.stop_flag.is_set(): continue
+                    attempt = timeouts = 0
+
+                    while not self.stop_flag.is_set() and limiter.acquire(self.stop_flag):
+                        attempt += 1
+                        proxy = cycler.next()
+                        # the last retry gets the full ceiling: slow but healthy beats an error
+                        budget = tmo.budget if timeouts < TIMEOUT_RETRIES else tmo.full
+                        t = time.perf_counter()
+                        try:
+                            r = pool.get(proxy).post(self.url,
+                                data=json.dumps({"botname": name}),
+                                proxies=proxy, timeout=budget)
+                            resp = r.text.strip()
+                            tmo.observe(time.perf_counter() - t)
+
+                            outcome = verdict(resp)
+                            if outcome is Outcome.LIMITED:
+                                self.rate_limited(name, retry_after(r.headers))
+                                continue
+                            self.record(name, resp, outcome, time.perf_counter() - t)
+                            break
+
+                        except Timeout as exc:
+                            # urllib3 discards the timed out connection, the retry gets a fresh one
+                            metrics.count("timeouts")
+                            tmo.timed_out(timeout_kind(exc), budget)
+                            timeouts += 1
+                            if timeouts <= TIMEOUT_RETRIES:
+                                metrics.count("retries")
+                                continue
+                            self.record(name, timeout_msg(exc, budget), Outcome.ERR, time.perf_counter() - t)
+                            break
+
+                        except Exception as exc:
+                            if proxy and attempt < retries:
+                                cycler.kill(proxy)
+                                pool.drop(proxy)
+                                if cycler.alive > 0:
+                                    metrics.count("retries")
+                                    continue
+                            self.record(name, str(exc)[:80], Outcome.ERR, time.perf_counter() - t)
+                            break
+            finally:
+                with idle:
+                    busy[0] -= 1
+                    idle.notify_all()
+
+        def wake():
+            # stop(): drop the queued names so a blocked feeder returns at once,
+            # and let the drain below start its clock. Sentinels already queued
+            # go back in, or idle workers would wait on q.get() forever; the
+            # queue holds threads * 4, so putting them back never blocks
+            ends = 0
+            try:
+                while True: ends += q.get_nowait() is None
+            except Empty: pass
+            for _ in range(ends): q.put(None)
+            with idle: idle.notify_all()
+
+        worker = self._profiled(worker, "worker")
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.threads)]
+        for t in threads: t.start()
+        self._wake = wake
+        try:
+            # feed the bounded queue while workers drain it, then one sentinel per worker
+            for name in names:
+                if self.stop_flag.is_set(): break
+                q.put(name)
+            for _ in threads: q.put(None)
+
+            with idle:
+                idle.wait_for(lambda: not busy[0] or self.stop_flag.is_set())
+                # stopped: requests already in flight get STOP_GRACE to land,
+                # stragglers are abandoned and their names rechecked on resume
+                idle.wait_for(lambda: not busy[0], timeout=STOP_GRACE)
+        finally:
+            self._wake = None
+            self.seal()
+            pool.close()
+
+    async def _run_async(self, names):
+        # same check/classify/record cycle as the threaded worker, one task per
+        # in-flight name, bounded by the semaphore
+        import asyncio, aiohttp
+        cycler, limiter, limit = self.cycler, self.limiter, self.threads
+        metrics, tmo, verdict = self.metrics, self.timeout, self.classify
+        retries = max(cycler.total, 1) * 2
+        sem = asyncio.Semaphore(limit)
+        inflight = set()
+        stopping = asyncio.Event()
+
+        async def check(session, name):
+            try:
+                attempt = timeouts = 0
+                while not self.stop_flag.is_set() and await limiter.acquire_async(stopping):
                     attempt += 1
                     proxy = cycler.next()
+                    budget = tmo.budget if timeouts < TIMEOUT_RETRIES else tmo.full
+                    t = time.perf_counter()
                     try:
-                        r = requests.post("https://api.ai.com/user/botname/check",
-                            data=json.dumps({"botname": name}),
-                            headers={"Content-Type": "application/json",
-                                     "Cookie": f"token={token};"},
-                            proxies=proxy, timeout=15)
-                        resp = r.text.strip()
-
-                        if "exceeded the site's rate limits" in resp.lower():
-                            self.after(0, lambda n=name: self.write_log(
-                                f" \u23f3 {n}: rate-limited, retrying...", "rl"))
-                            time.sleep(10)
+                        async with session.post(self.url, data=json.dumps({"botname": name}),
+                                proxy=proxy["http"] if proxy else None,
+                                timeout=aiohttp.ClientTimeout(total=self.timeout_max,
+                                    sock_connect=budget[0], sock_read=budget[1])) as r:
+                            resp = (await r.text()).strip()
+                        tmo.observe(time.perf_counter() - t)
+
+                        outcome = verdict(resp)
+                        if outcome is Outcome.LIMITED:
+                            self.rate_limited(name, retry_after(r.headers))
                             continue
+                        self.record(name, resp, outcome, time.perf_counter() - t)
+                        break
 
-                        # try parsing json response
-                        try:
-                            data = json.loads(resp)
-                            if data.get("available", False):
-                                tag = "avail"
-                                with self.lock: self.avail += 1
-                            else:
-                                tag = "taken"
-                                with self.lock: self.taken += 1
-                        except (json.JSONDecodeError, AttributeError):
-                            # fallback to string matching
-                            if "available" in resp.lower():
-                                tag = "avail"
-                                with self.lock: self.avail += 1
-                            elif "taken" in resp.lower() or "unavailable" in resp.lower():
-                                tag = "taken"
-                                with self.lock: self.taken += 1
-                            else:
-                                with self.lock: self.errs += 1
+                    except asyncio.TimeoutError as exc:
+                        # aiohttp closes the timed out connection, the retry gets a fresh one
+                        metrics.count("timeouts")
+                        tmo.timed_out(timeout_kind(exc), budget)
+                        timeouts += 1
+                        if timeouts <= TIMEOUT_RETRIES:
+                            metrics.count("retries")
+                            continue
+                        self.record(name, timeout_msg(exc, budget), Outcome.ERR, time.perf_counter() - t)
                         break
 
                     except Exception as exc:
                         if proxy and attempt < retries:
                             cycler.kill(proxy)
-                            if cycler.alive > 0: continue
-                        resp = str(exc)[:80]
-                        with self.lock: self.errs += 1
+                            if cycler.alive > 0:
+                                metrics.count("retries")
+                                continue
+                        self.record(name, str(exc)[:80] or type(exc).__name__, Outcome.ERR,
+                            time.perf_counter() - t)
                         break
+            finally:
+                sem.release()
+
+        loop = asyncio.get_running_loop()
+
+        def wake():
+            try: loop.call_soon_threadsafe(stopping.set)
+            except RuntimeError: pass  # loop already closed, nothing left to stop
+
+        async def watch_stop():
+            await stopping.wait()
+            # requests already in flight get STOP_GRACE to land, then are
+            # cancelled; a resume rechecks their names
+            if inflight: await asyncio.wait(list(inflight), timeout=STOP_GRACE)
+            for t in list(inflight): t.cancel()
+
+        self._wake = wake
+        if self.stop_flag.is_set(): stopping.set()
+        conn = aiohttp.TCPConnector(limit=limit)
+        try:
+            async with aiohttp.ClientSession(connector=conn, headers=self.headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout_max)) as session:
+                watcher = asyncio.create_task(watch_stop())
+                for name in names:
+                    await sem.acquire()
+                    if self.stop_flag.is_set():
+                        sem.release()
+                        break
+                    t = asyncio.create_task(check(session, name))
+                    inflight.add(t)
+                    t.add_done_callback(inflight.discard)
+                if inflight: await asyncio.gather(*inflight, return_exceptions=True)
+                watcher.cancel()
+        finally:
+            self._wake = None
+            self.seal()
+
+
+# sharded runs
+
+def merge_segments(path, segments, fmt="txt"):
+    # appends shard output segments to path and removes them; works on any
+    # leftovers too, so segments of a crashed run are merged by the next one
+    done = 0
+    fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        if fmt == "csv" and fresh: csv.writer(f).writerow(ResultWriter.FIELDS)
+        for seg in segments:
+            if not os.path.exists(seg): continue
+            with open(seg, "r", encoding="utf-8", newline="") as part:
+                if fmt == "csv": part.readline()  # the segment's own header
+                shutil.copyfileobj(part, f)
+            os.remove(seg)
+            done += 1
+    return done
+
+
+def _shard_main(kw, index, count, conn, ctl):
+    # child process: one CheckEngine over this shard's names, rows and
+    # counters go up the pipe every SHARD_REPORT_S
+    import signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # ctrl-c hits the whole group, the parent stops us
+    logs = SimpleQueue()
+    engine = CheckEngine(shard=(index, count), on_log=lambda text, tag: logs.put((text, tag)), **kw)
+    sent = 0
+
+    def report(final=False):
+        nonlocal sent
+        t, m = engine.results, engine.metrics
+        n = len(t)
+        rows = [t.row(i) for i in range(sent, n)]
+        sent = n
+        msgs = []
+        try:
+            while True: msgs.append(logs.get_nowait())
+        except Empty: pass
+        conn.send({"rows": rows, "logs": msgs, "total": engine.total, "feeding": engine.feeding,
+            "retries": m.retries, "limits": m.limits, "timeouts": m.timeouts,
+            "dead": engine.cycler.dead, "final": final})
+
+    def watch():
+        # a stop message or the parent going away, either way wind down
+        try: ctl.recv()
+        except (EOFError, OSError): pass
+        engine.stop()
+
+    threading.Thread(target=watch, daemon=True).start()
+    engine.start()
+    while not engine.wait(SHARD_REPORT_S): report()
+    report(final=True)
+    conn.close()
+
+
+class ShardedEngine(CheckEngine):
+    # the same run split over `shards` processes by a stable hash of the
+    # name. Every shard checks, caches and writes its own output segment; this
+    # process only merges their rows and counters (so the ui and counters work
+    # unchanged) and, at the end, the segments. A shard that dies takes only
+    # its unflushed results with it, its cache run resumes next time
+    def __init__(self, token, shards=2, names=None, path=None, threads=10, engine="threads",
+            out_fmt="txt", out_path=None, metrics_path=None, metrics_fmt=None, profiler=None,
+            on_log=None, on_result=None, on_done=None, **kw):
+        self.shards = max(1, min(MAX_SHARDS, int(shards)))
+        cap = MAX_INFLIGHT if engine == "async" else MAX_THREADS
+        per = max(1, min(cap, -(-int(threads) // self.shards)))
+        super().__init__(token, names=names, path=path, threads=per, engine=engine, out_fmt=out_fmt,
+            out_path=out_path, metrics_path=metrics_path, metrics_fmt=metrics_fmt, profiler=profiler,
+            on_log=on_log, on_result=on_result, on_done=on_done, **kw)
+        self.out_path = out_path or OUT_FILES[out_fmt]
+        # what every shard process gets besides its names and segment
+        self._kw = dict(token=token, threads=per, engine=engine, out_fmt=out_fmt, **kw)
+        import multiprocessing
+        self._ctx = multiprocessing.get_context("spawn")  # no fork with threads around
+        self._ctl = []  # parent ends of the per-shard stop pipes
+
+    def segment(self, i):
+        return f"{self.out_path}.shard{i}"
+
+    def stop(self):
+        self.stop_flag.set()
+        for ctl in self._ctl:
+            try: ctl.send("stop")
+            except OSError: pass  # that shard is already gone
 
-                with self.lock: self.checked += 1
-                icon = {"avail": "\u2713", "taken": "\u2717", "err": "\u26a0"}.get(tag, "\u00b7")
-                self.after(0, lambda n=name, rt=resp, t=tag, ic=icon:
-                    self.write_log(f" {ic} {n}: {rt}", t))
-                self.after(0, lambda: self.update_stats(cycler))
-
-                with self.lock:
-                    with open("checked.txt", "a", encoding="utf-8") as f:
-                        f.write(f"{name}: {resp}\n")
-                q.task_done()
-
-        def run():
-            threads = [threading.Thread(target=worker, daemon=True) for _ in range(n_thr)]
-            for t in threads: t.start()
-            for t in threads: t.join()
-            self.after(0, self.finish)
-
-        threading.Thread(target=run, daemon=True).start()
+    def snapshot(self):
+        return {**super().snapshot(), "threads": self.threads * self.shards, "shards": self.shards}
 
-    def do_stop(self):
-        self.stop_flag.set()
-        self.prog_lbl.configure(text=f"Stopping...  {self.checked}/{self.total}")
-
-    def finish(self):
-        self.running = False
-        self.start_btn.configure(state="normal")
-        self.stop_btn.configure(state="disabled")
-        elapsed = time.time() - self.t0
-        self.pbar.set(1.0 if self.checked >= self.total else self.checked / max(self.total, 1))
-        self.prog_lbl.configure(
-            text=f"Done \u2014 {self.checked}/{self.total} checked in {elapsed:.1f}s", text_color=GREEN)
-        self.write_log(f"\n Finished in {elapsed:.1f}s  "
-            f"({self.avail} available, {self.taken} taken, {self.errs} errors)", "dim")
-
-    def on_close(self):
-        self.stop_flag.set()
-        self.after(100, self.destroy)
+    def run(self):
+        self.t0 = time.time()
+        self.active = self.feeding = True
+        slots = "in-flight" if self.engine == "async" else "threads"
+        self.log(f" \u25cb Sharded run: {self.shards} processes x {self.threads} {slots}", "dim")
+        exporter = self._exporter()
+        try:
+            self._run_shards()
+        finally:
+            self.feeding = False
+            self.elapsed = time.time() - self.t0
+            self.active = False
+            try:
+                if exporter: exporter.close()  # final snapshot lands before anyone is told we're done
+            finally:
+                self.done.set()
+                if self.on_done: self.on_done(self)
+
+    def _run_shards(self):
+        from multiprocessing.connection import wait
+        procs, live = {}, {}
+        for i in range(self.shards):
+            kw = dict(self._kw, out_path=self.segment(i))
+            if self.names is not None:
+                part = [n for n in self.names if shard_of(n, self.shards) == i]
+                if not any(len(n.strip()) >= MIN_LEN for n in part): continue
+                kw["names"] = part
+            else:
+                kw["path"] = self.path
+            recv, send = self._ctx.Pipe(duplex=False)
+            ctl_recv, ctl = self._ctx.Pipe(duplex=False)
+            p = self._ctx.Process(target=_shard_main, args=(kw, i, self.shards, send, ctl_recv),
+                name=f"shard-{i}", daemon=True)
+            p.start()
+            send.close()
+            ctl_recv.close()
+            procs[i], live[recv] = p, i
+            self._ctl.append(ctl)
+            if self.stopped: ctl.send("stop")  # stop() came in while spawning
+
+        state = {i: {"total": 0, "feeding": True, "retries": 0, "limits": 0, "timeouts": 0}
+            for i in procs}
+        finished, deadline = set(), None
+        try:
+            while live:
+                if self.stopped and deadline is None: deadline = time.monotonic() + SHARD_STOP_WAIT
+                if deadline and time.monotonic() > deadline: break
+                for conn in wait(list(live), timeout=SHARD_REPORT_S * 4):
+                    try: msg = conn.recv()
+                    except (EOFError, OSError):
+                        del live[conn]  # shard exited, cleanly or not
+                        continue
+                    i = live[conn]
+                    self._merge(i, msg, state[i])
+                    if msg["final"]: finished.add(i)
+                self.total = sum(st["total"] for st in state.values())
+                self.feeding = any(st["feeding"] for st in state.values())
+        finally:
+            for p in procs.values():
+                p.join(SHARD_STOP_WAIT if deadline is None else max(0.1, deadline - time.monotonic()))
+                if p.is_alive(): p.terminate()
+                p.join()
+            for conn in live: conn.close()
+            ctls, self._ctl = self._ctl, []
+            for ctl in ctls: ctl.close()
+
+        for i, p in procs.items():
+            if i not in finished or p.exitcode:
+                self.log(f" \u26a0 Shard {i} died (exit code {p.exitcode}); what it flushed is kept, "
+                    f"the rest is rechecked on the next run", "err")
+        n = merge_segments(self.out_path, [self.segment(i) for i in range(self.shards)], self.out_fmt)
+        if n: self.log(f" \u25cb Merged {n} shard segments into {self.out_path}", "dim")
+
+    def _merge(self, i, msg, st):
+        for text, tag in msg["logs"]: self.log(f"{text} [shard {i}]", tag)
+        t, m = self.results, self.metrics
+        for name, tag, resp, latency, ts in msg["rows"]:
+            row = t.append(name, STATUS[tag], resp, latency, ts)
+            m.observe(latency)
+            if self.on_result: self.on_result(row)
+        for key in ("retries", "limits", "timeouts"):
+            if msg[key] > st[key]: m.count(key, msg[key] - st[key])
+            st[key] = msg[key]
+        st["total"], st["feeding"] = msg["total"], msg["feeding"] and not msg["final"]
+        for key in msg["dead"]: self.cycler.kill({"http": key})
+
+
+def make_engine(token, shards=1, **kw):
+    return ShardedEngine(token, shards=shards, **kw) if shards > 1 else CheckEngine(token, **kw)
+
+
+# headless cli
+
+def fmt_secs(s):
+    if s is None: return "\u2014"
+    s = int(s)
+    return f"{s // 3600}:{s // 60 % 60:02d}:{s % 60:02d}" if s >= 3600 else f"{s // 60}:{s % 60:02d}"
+
+
+def fmt_latency(m):
+    p = [m.percentile(q) for q in (50, 95, 99)]
+    return "\u2014" if p[0] is None else "/".join(f"{v:.0f}" for v in p) + " ms"
+
+
+def progress_line(e):
+    pct = f"  ({e.checked / e.total:.0%})" if e.total else ""
+    more = "+" if e.feeding else ""
+    m = e.metrics
+    return (f"[{time.time() - e.t0:7.1f}s] {e.checked}/{e.total}{more}{pct}  "
+        f"avail {e.avail}  taken {e.taken}  errs {e.errs}  {m.rate():.1f}/s  "
+        f"p50/95/99 {fmt_latency(m)}  retries {m.retries}  limits {m.limits}  "
+        f"timeouts {m.timeouts}  eta {fmt_secs(e.eta())}")
+
+
+def run_headless(args):
+    proxies = []
+    if args.proxies:
+        with open(args.proxies, "r", encoding="utf-8") as f:
+            proxies = parse_proxies(f.read(), args.proxy_type)
+
+    # one write per line, print() from several workers interleaves text and newline
+    def on_log(text, tag):
+        sys.stderr.write(text.strip("\n") + "\n")
+
+    def on_result(row):
+        sys.stderr.write(engine.results.line(row) + "\n")
+
+    profiler = Profiler().start() if args.profile else None
+    try:
+        engine = make_engine(args.token or os.environ.get("DM_TOKEN", ""), shards=args.shards,
+            path=args.headless, threads=args.threads, engine=args.engine, proxies=proxies, out_fmt=args.format,
+            out_path=args.out, ttl=args.ttl, url=args.url, timeout=args.timeout, metrics_path=args.metrics,
+            metrics_fmt=args.metrics_format, profiler=profiler, on_log=on_log,
+            rules=args.rules, on_result=on_result if args.verbose else None)
+    except ValueError as exc:
+        if profiler: profiler.stop()
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    engine.start()
+    try:
+        while not engine.wait(args.progress):
+            print(progress_line(engine), file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        print("stopping...", file=sys.stderr, flush=True)
+        engine.stop()
+        engine.wait()
+    print(progress_line(engine), file=sys.stderr)
+    outcome = "Failed" if engine.error else "Stopped" if engine.stopped else "Finished"
+    print(f"{outcome} in {engine.elapsed:.1f}s  "
+        f"({engine.avail} available, {engine.taken} taken, {engine.errs} errors)", file=sys.stderr)
+    if profiler:
+        profiler.stop()
+        print(f"profile written to {profiler.dump(args.profile)}", file=sys.stderr)
+    return 1 if engine.error else 130 if engine.stopped else 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="ai.com botname checker")
+    ap.add_argument("--headless", metavar="NAMES", help="check a names file without the gui")
+    ap.add_argument("--token", help="ai.com token (default: $DM_TOKEN)")
+    ap.add_argument("--threads", type=int, default=10, help="threads, or in-flight requests for async")
+    ap.add_argument("--engine", choices=ENGINES, default="threads")
+    ap.add_argument("--shards", type=int, default=1, metavar="N",
+        help="split the run over N processes, --threads is divided between them")
+    ap.add_argument("--proxies", metavar="FILE", help="proxy list, one per line")
+    ap.add_argument("--proxy-type", choices=("http", "socks5"), default="http")
+    ap.add_argument("--format", choices=list(OUT_FILES), default="txt", help="output format")
+    ap.add_argument("--out", metavar="FILE", help="output file (default: checked.<format>)")
+    ap.add_argument("--url", default=CHECK_URL,
+        help="check endpoint (default: $DM_CHECK_URL or the ai.com api)")
+    ap.add_argument("--timeout", type=float, default=TIMEOUT_MAX, metavar="SEC",
+        help="request timeout ceiling; below it budgets follow observed latency")
+    ap.add_argument("--rules", metavar="FILE",
+        help=f"response classification rules as json (default: {RULES_FILE} if present)")
+    ap.add_argument("--ttl", type=float, default=0.0, help="skip names checked within this many hours")
+    ap.add_argument("--metrics", metavar="FILE",
+        help=f"write a metrics snapshot every {METRICS_S:.0f}s (.prom = prometheus text format)")
+    ap.add_argument("--metrics-format", choices=list(METRICS_FILES), help="override the --metrics format")
+    ap.add_argument("--profile", nargs="?", const=PROFILE_FILE, metavar="FILE",
+        help=f"profile the run (cProfile per thread, tracemalloc, lock waits), report to FILE "
+            f"(default {PROFILE_FILE})")
+    ap.add_argument("--progress", type=float, default=5.0, metavar="SEC", help="progress interval")
+    ap.add_argument("-v", "--verbose", action="store_true", help="print every result to stderr")
+    args = ap.parse_args(argv)
+
+    if args.headless:
+        return run_headless(args)
+    from dark_matter_gui import run_gui
+    run_gui()
+    return 0
 
 
 if __name__ == "__main__":
-    ctk.set_appearance_mode("dark")
-    ctk.set_default_color_theme("dark-blue")
-    App().mainloop()
+    sys.exit(main())
@@ -0,0 +1,845 @@
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import filedialog
+import threading, itertools
+import time, math, os
+from contextlib import nullcontext
+import numpy as np
+from queue import SimpleQueue, Empty
+from array import array
+
+from dark_matter_checker import (make_engine, Profiler, Status, parse_proxies, count_lines, fmt_secs,
+    fmt_latency, OUT_FILES, METRICS_FILES, PROFILE_FILE, STATUS)
+
+# colors
+BG = "#08080f"
+SURFACE = "#111128"
+CARD = "#16163a"
+BORDER = "#252560"
+ACCENT = "#7c3aed"
+ACCENT_HVR = "#9333ea"
+ACCENT_LT = "#a78bfa"
+ACCENT_DIM = "#4c1d95"
+GREEN = "#10b981"
+RED = "#ef4444"
+AMBER = "#f59e0b"
+CYAN = "#06b6d4"
+TEXT = "#e2e8f0"
+TEXT_DIM = "#94a3b8"
+TEXT_MUTED = "#475569"
+P_COLORS = ["#7c3aed", "#6d28d9", "#8b5cf6", "#4c1d95", "#312e81"]
+
+PUMP_MS = 100       # ui drain interval
+PUMP_BATCH = 5000   # max log lines per drain
+VIEW_LINES = 2000   # lines kept in the results widget
+STREAM_BYTES = 256 * 1024  # name files above this stream from disk instead of the textbox
+PREVIEW_LINES = 200
+CLOSE_WAIT = 3.0    # max seconds closing the window waits for a running check to wind down
+
+
+LUT_LEVELS = 64
+LINK_DIST = 105
+
+
+def blend(hex_c, alpha):
+    a = max(0.0, min(1.0, alpha))
+    r1, g1, b1 = int(hex_c[1:3], 16), int(hex_c[3:5], 16), int(hex_c[5:7], 16)
+    r0, g0, b0 = 8, 8, 15  # bg rgb
+    return f"#{int(r1*a+r0*(1-a)):02x}{int(g1*a+g0*(1-a)):02x}{int(b1*a+b0*(1-a)):02x}"
+
+
+def alpha_lut(hex_c, top=1.0, levels=LUT_LEVELS):
+    # precomputed fills for alpha in [0, top], indexed by quantized level
+    return [blend(hex_c, top * k / (levels - 1)) for k in range(levels)]
+
+
+class ParticleField:
+    # forward half of the 3x3 block, so each cell pair is visited once
+    _NEIGHBOURS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+    def __init__(self, w, h, n, rng=None):
+        rng = rng or np.random.default_rng()
+        self.w, self.h, self.n = w, h, n
+        self.x = rng.uniform(0, w, n)
+        self.y = rng.uniform(0, h, n)
+        self.r = rng.uniform(1.0, 2.8, n)
+        self.vx = rng.uniform(-0.35, 0.35, n)
+        self.vy = rng.uniform(-0.35, 0.35, n)
+        self.base_a = rng.uniform(0.35, 1.0, n)
+        self.phase = rng.uniform(0, math.tau, n)
+        self.freq = rng.uniform(0.012, 0.035, n)
+        self.color = rng.integers(0, len(P_COLORS), n)
+        self.alpha = self.base_a.copy()
+
+    def step(self, t):
+        np.mod(self.x + self.vx, self.w, out=self.x)
+        np.mod(self.y + self.vy, self.h, out=self.y)
+        np.multiply(self.base_a, 0.45 + 0.55 * np.sin(t * self.freq + self.phase), out=self.alpha)
+
+    def links(self, dist):
+        # uniform grid with cell size == dist: neighbours can only sit in adjacent cells
+        gw, gh = int(self.w // dist) + 1, int(self.h // dist) + 1
+        cell = (self.x // dist).astype(np.intp) * gh + (self.y // dist).astype(np.intp)
+        order = np.argsort(cell, kind="stable")
+        bounds = np.searchsorted(cell[order], np.arange(gw * gh + 1))
+
+        ii, jj, dd = [], [], []
+        for cx in range(gw):
+            for cy in range(gh):
+                c = cx * gh + cy
+                a = order[bounds[c]:bounds[c+1]]
+                if not len(a): continue
+                for ox, oy in self._NEIGHBOURS:
+                    nx, ny = cx + ox, cy + oy
+                    if nx >= gw or not 0 <= ny < gh: continue
+                    nc = nx * gh + ny
+                    b = order[bounds[nc]:bounds[nc+1]]
+                    if not len(b): continue
+                    d = np.hypot(self.x[a, None] - self.x[b], self.y[a, None] - self.y[b])
+                    m = d < dist
+                    if nc == c: m = np.triu(m, 1)
+                    ia, ib = np.nonzero(m)
+                    ii.append(a[ia]); jj.append(b[ib]); dd.append(d[ia, ib])
+
+        if not ii:
+            empty = np.empty(0, np.intp)
+            return empty, empty, np.empty(0)
+        return np.concatenate(ii), np.concatenate(jj), np.concatenate(dd)
+
+
+class FrameJob:
+    def __init__(self, name, fn, interval):
+        self.name = name
+        self.fn = fn
+        self.interval = interval  # ms, target rate
+        self.scale = 1.0          # current slowdown factor
+        self.active = False
+        self.after_id = None
+        self.due = 0.0
+
+
+class FrameScheduler:
+    # drives cosmetic animations: backs off when frames run long or the tk
+    # queue is late, parks everything while hidden or in low-power mode
+    def __init__(self, root, budget=0.008, max_scale=8.0, unfocused_scale=3.0):
+        self.root = root
+        self.budget = budget
+        self.max_scale = max_scale
+        self.unfocused_scale = unfocused_scale
+        self.jobs = {}
+        self.hidden = False
+        self.focused = True
+        self.low_power = False
+        self.profiler = None  # set while a profiled run is going, times every frame
+        for ev in ("<Map>", "<Unmap>"):
+            root.bind(ev, self._on_map, add="+")
+        for ev in ("<FocusIn>", "<FocusOut>"):
+            root.bind(ev, lambda e: self.root.after(20, self._check_focus), add="+")
+
+    @property
+    def suspended(self):
+        return self.hidden or self.low_power
+
+    def add(self, name, fn, interval):
+        self.jobs[name] = FrameJob(name, fn, interval)
+        self.start(name)
+
+    def start(self, name):
+        job = self.jobs[name]
+        job.active, job.scale = True, 1.0
+        self._schedule(job, 0)
+
+    def stop(self, name):
+        job = self.jobs.get(name)
+        if not job: return
+        job.active = False
+        if job.after_id:
+            self.root.after_cancel(job.after_id)
+            job.after_id = None
+
+    def set_low_power(self, on):
+        self.low_power = bool(on)
+        self._resume()
+
+    def _on_map(self, e):
+        if e.widget is not self.root: return
+        self.hidden = e.type == tk.EventType.Unmap or self.root.state() == "iconic"
+        self._resume()
+
+    def _check_focus(self):
+        try: self.focused = self.root.focus_displayof() is not None
+        except (KeyError, tk.TclError): self.focused = True
+
+    def _resume(self):
+        for job in self.jobs.values():
+            if job.active and not job.after_id:
+                job.scale = 1.0
+                self._schedule(job, 0)
+
+    def _schedule(self, job, delay):
+        if job.after_id or not job.active or self.suspended: return
+        job.due = time.perf_counter() + delay / 1000
+        job.after_id = self.root.after(int(delay), lambda: self._run(job))
+
+    def _run(self, job):
+        job.after_id = None
+        if not job.active or self.suspended: return
+        t = time.perf_counter()
+        lag = t - job.due
+        job.fn()
+        cost = time.perf_counter() - t
+        if self.profiler: self.profiler.add_time(f"frame.{job.name}", cost)
+
+        # multiplicative backoff, slow recovery back to the target rate
+        if cost > self.budget or lag > job.interval / 2000:
+            job.scale = min(self.max_scale, job.scale * 1.5)
+        else:
+            job.scale = max(1.0, job.scale * 0.9)
+        floor = 1.0 if self.focused else self.unfocused_scale
+        self._schedule(job, job.interval * max(job.scale, floor))
+
+
+class ParticleCanvas(tk.Canvas):
+    def __init__(self, master, frames, w=720, h=110, n=50, max_lines=None, **kw):
+        super().__init__(master, width=w, height=h, bg=BG, highlightthickness=0, **kw)
+        self._cw, self._ch, self._tick = w, h, 0
+        self.field = ParticleField(w, h, n)
+
+        self._dot_lut = [alpha_lut(c) for c in P_COLORS]
+        self._line_lut = alpha_lut(ACCENT_LT, 0.28)
+        self._dot_lvl = np.full(n, -1, np.intp)
+
+        self.dots = [self.create_oval(0,0,0,0, fill=P_COLORS[c], outline="") for c in self.field.color]
+        self.max_lines = max_lines or max(90, 2 * n)
+        self.lines = [self.create_line(0,0,0,0, fill="", width=1) for _ in range(self.max_lines)]
+        self._line_lvl = np.full(self.max_lines, -1, np.intp)
+        self._lines_used = self.max_lines
+
+        self.create_text(w//2, h//2 - 14, text="DARK MATTER", font=("Segoe UI", 26, "bold"), fill=TEXT)
+        self.create_text(w//2, h//2 + 16, text="ai.com Botname Checker", font=("Segoe UI", 11), fill=TEXT_DIM)
+        self.create_text(w - 8, h - 6, text="credits to @crysiox", font=("Segoe UI", 8), fill=TEXT_MUTED, anchor="se")
+
+        frames.add("header", self._animate, 33)
+
+    def _animate(self):
+        self._tick += 1
+        f = self.field
+        f.step(self._tick)
+        a = np.clip(f.alpha, 0.0, 1.0)
+        top = LUT_LEVELS - 1
+
+        # dots: coords every frame, fill only when the quantized alpha moved
+        r = f.r * (0.75 + 0.5 * f.alpha)
+        boxes = np.stack([f.x - r, f.y - r, f.x + r, f.y + r], 1).tolist()
+        for item, box in zip(self.dots, boxes):
+            self.coords(item, *box)
+        lvl = (a * top + 0.5).astype(np.intp)
+        for i in np.flatnonzero(lvl != self._dot_lvl).tolist():
+            self.itemconfigure(self.dots[i], fill=self._dot_lut[f.color[i]][lvl[i]])
+        self._dot_lvl = lvl
+
+        # lines: grid neighbour pairs, brightest first when over budget
+        i, j, d = f.links(LINK_DIST)
+        la = (1 - d / LINK_DIST) * np.minimum(a[i], a[j])
+        if len(la) > self.max_lines:
+            keep = np.argpartition(-la, self.max_lines)[:self.max_lines]
+            i, j, la = i[keep], j[keep], la[keep]
+        llvl = (la * top + 0.5).astype(np.intp)
+        segs = np.stack([f.x[i], f.y[i], f.x[j], f.y[j]], 1).tolist()
+        for k, seg in enumerate(segs):
+            self.coords(self.lines[k], *seg)
+            if llvl[k] != self._line_lvl[k]:
+                self.itemconfigure(self.lines[k], fill=self._line_lut[llvl[k]])
+                self._line_lvl[k] = llvl[k]
+
+        for k in range(len(segs), self._lines_used):
+            self.coords(self.lines[k], -1,-1,-1,-1)
+        self._lines_used = len(segs)
+
+
+# results history
+
+LOG_TAGS = ("dim", "proxy", "avail", "taken", "err", "rl")
+LOG_FILTERS = {"All": None, "Available": "avail", "Taken": "taken", "Errors": "err"}
+
+
+class ResultLog:
+    # run history by reference: results stay in the engine's ResultTable and
+    # are only formatted for the lines actually shown, status messages are
+    # the only text kept here
+    def __init__(self):
+        self.clear()
+
+    def clear(self, table=None):
+        self.table = table
+        self.msgs = []
+        self.msg_tags = array("B")
+        self.refs = array("q")  # >= 0: table row, < 0: ~message index
+        self.rows = 0           # table rows taken in so far
+
+    def __len__(self):
+        return len(self.refs)
+
+    def add(self, text, tag):
+        self.refs.append(~len(self.msgs))
+        self.msgs.append(text)
+        self.msg_tags.append(LOG_TAGS.index(tag))
+
+    def catch_up(self, upto=None):
+        # takes in table rows that landed since the last call (or up to `upto`)
+        if self.table is None: return
+        n = len(self.table) if upto is None else min(upto, len(self.table))
+        if n > self.rows:
+            self.refs.extend(range(self.rows, n))
+            self.rows = n
+
+    def count(self, tag=None):
+        if tag is None: return len(self.refs)
+        return self.table.count(STATUS[tag]) if self.table else 0
+
+    def render(self, ref):
+        if ref < 0: return self.msgs[~ref], LOG_TAGS[self.msg_tags[~ref]]
+        return self.table.line(ref), Status(self.table.status[ref]).tag
+
+    def tail(self, tag=None, n=VIEW_LINES, since=None):
+        # last n entries, optionally only those added from history index `since`
+        if tag is None:
+            lo = len(self.refs) - n if since is None else max(since, len(self.refs) - n)
+            return [self.render(r) for r in self.refs[max(0, lo):]]
+        if self.table is None: return []
+        first = 0 if since is None else self._first_row(since)
+        return [self.render(r) for r in self.table.tail(STATUS[tag], n) if r >= first]
+
+    def _first_row(self, since):
+        # first table row added at or after history index `since`
+        for r in self.refs[since:]:
+            if r >= 0: return r
+        return self.rows
+
+
+# main gui
+
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        self.title("Dark Matter - ai.com Checker")
+        self.geometry("720x960")
+        self.configure(fg_color=BG)
+        self.resizable(False, False)
+
+        self.running = False
+        self.checker = None
+        self.prof = None
+        self._ui_prof = None
+        self.show_tok = False
+        self.names_path = None
+        self.names_est = None
+        self.history = ResultLog()
+        self._view_n = 0
+        self.ui_q = SimpleQueue()
+        self._pump_id = None
+
+        self.setup_ui()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def setup_ui(self):
+        self.frames = FrameScheduler(self)
+        ParticleCanvas(self, self.frames, w=720, h=110, n=50).pack(fill="x")
+
+        main = ctk.CTkFrame(self, fg_color=BG, corner_radius=0)
+        main.pack(fill="both", expand=True, padx=24, pady=(12, 24))
+
+        # token
+        tf = self.make_card(main)
+        self.section_lbl(tf, "TOKEN")
+        row = ctk.CTkFrame(tf, fg_color="transparent")
+        row.pack(fill="x", padx=16, pady=(0, 12))
+
+        self.tok_entry = ctk.CTkEntry(row, placeholder_text="Paste your ai.com token...",
+            fg_color=CARD, border_color=BORDER, border_width=1, text_color=TEXT,
+            placeholder_text_color=TEXT_MUTED, font=("Consolas", 13), height=38, show="\u2022")
+        self.tok_entry.pack(side="left", fill="x", expand=True, padx=(0, 8))
+
+        ctk.CTkButton(row, text="\U0001f441", width=38, height=38, fg_color=CARD,
+            hover_color=ACCENT_DIM, border_width=1, border_color=BORDER,
+            font=("Segoe UI", 14), command=self.toggle_tok).pack(side="right")
+
+        # botnames
+        nf = self.make_card(main)
+        hdr = ctk.CTkFrame(nf, fg_color="transparent")
+        hdr.pack(fill="x", padx=16, pady=(12, 4))
+        ctk.CTkLabel(hdr, text="BOTNAMES", font=("Segoe UI", 11, "bold"),
+            text_color=TEXT_DIM).pack(side="left")
+        self.names_lbl = ctk.CTkLabel(hdr, text="", font=("Segoe UI", 10), text_color=TEXT_MUTED)
+        self.names_lbl.pack(side="left", padx=(10, 0))
+        ctk.CTkButton(hdr, text="Load File", width=90, height=28, fg_color=ACCENT_DIM,
+            hover_color=ACCENT, text_color=TEXT, font=("Segoe UI", 11),
+            corner_radius=6, command=self.load_names).pack(side="right")
+        ctk.CTkButton(hdr, text="Clear", width=60, height=28, fg_color=CARD,
+            hover_color=ACCENT_DIM, text_color=TEXT_DIM, font=("Segoe UI", 11),
+            corner_radius=6, command=lambda: self.set_names_file(None)).pack(side="right", padx=(0, 6))
+
+        self.names_box = ctk.CTkTextbox(nf, height=100, fg_color=CARD, border_color=BORDER,
+            border_width=1, text_color=TEXT, font=("Consolas", 12), corner_radius=8)
+        self.names_box.pack(fill="x", padx=16, pady=(4, 12))
+
+        # proxies
+        pf = self.make_card(main)
+        phdr = ctk.CTkFrame(pf, fg_color="transparent")
+        phdr.pack(fill="x", padx=16, pady=(12, 4))
+        ctk.CTkLabel(phdr, text="PROXIES", font=("Segoe UI", 11, "bold"),
+            text_color=TEXT_DIM).pack(side="left")
+
+        self.proxy_type = ctk.StringVar(value="http")
+        ctk.CTkSegmentedButton(phdr, values=["http", "socks5"], variable=self.proxy_type,
+            font=("Segoe UI", 10), height=26, fg_color=CARD, selected_color=ACCENT,
+            selected_hover_color=ACCENT_HVR, unselected_color=CARD,
+            unselected_hover_color=ACCENT_DIM, text_color=TEXT).pack(side="right", padx=(8, 0))
+
+        ctk.CTkButton(phdr, text="Load File", width=90, height=28, fg_color=ACCENT_DIM,
+            hover_color=ACCENT, text_color=TEXT, font=("Segoe UI", 11),
+            corner_radius=6, command=self.load_proxies).pack(side="right")
+
+        self.proxy_box = ctk.CTkTextbox(pf, height=70, fg_color=CARD, border_color=BORDER,
+            border_width=1, text_color=TEXT, font=("Consolas", 11), corner_radius=8)
+        self.proxy_box.pack(fill="x", padx=16, pady=(4, 4))
+        ctk.CTkLabel(pf, text="ip:port  /  user:pass@ip:port  /  leave empty for direct",
+            font=("Segoe UI", 9), text_color=TEXT_MUTED).pack(anchor="w", padx=16, pady=(0, 10))
+
+        # controls
+        ctrl = ctk.CTkFrame(main, fg_color="transparent")
+        ctrl.pack(fill="x", pady=(0, 10))
+
+        left = ctk.CTkFrame(ctrl, fg_color=SURFACE, corner_radius=10,
+            border_width=1, border_color=BORDER)
+        left.pack(side="left")
+        ctk.CTkLabel(left, text="Threads", font=("Segoe UI", 11),
+            text_color=TEXT_DIM).pack(side="left", padx=(12, 6), pady=8)
+        self.thr_var = ctk.StringVar(value="10")
+        ctk.CTkEntry(left, textvariable=self.thr_var, width=48, height=30, fg_color=CARD,
+            border_color=BORDER, border_width=1, text_color=TEXT, font=("Consolas", 13),
+            justify="center").pack(side="left", padx=(0, 8), pady=8)
+        ctk.CTkLabel(left, text="Shards", font=("Segoe UI", 11),
+            text_color=TEXT_DIM).pack(side="left", padx=(0, 6), pady=8)
+        self.shards_var = ctk.StringVar(value="1")
+        ctk.CTkEntry(left, textvariable=self.shards_var, width=36, height=30, fg_color=CARD,
+            border_color=BORDER, border_width=1, text_color=TEXT, font=("Consolas", 13),
+            justify="center").pack(side="left", padx=(0, 8), pady=8)
+        self.engine_var = ctk.StringVar(value="threads")
+        ctk.CTkSegmentedButton(left, values=["threads", "async"], variable=self.engine_var,
+            font=("Segoe UI", 10), height=26, fg_color=CARD, selected_color=ACCENT,
+            selected_hover_color=ACCENT_HVR, unselected_color=CARD,
+            unselected_hover_color=ACCENT_DIM, text_color=TEXT).pack(side="left", padx=(0, 12), pady=8)
+
+        self.low_power = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(left, text="Low power", variable=self.low_power,
+            font=("Segoe UI", 11), text_color=TEXT_DIM, fg_color=ACCENT, hover_color=ACCENT_HVR,
+            border_color=BORDER, checkbox_width=18, checkbox_height=18,
+            command=lambda: self.frames.set_low_power(self.low_power.get())
+            ).pack(side="left", padx=(0, 12), pady=8)
+
+        self.stop_btn = ctk.CTkButton(ctrl, text="\u23f9  STOP", width=120, height=42,
+            fg_color="#7f1d1d", hover_color=RED, text_color=TEXT,
+            font=("Segoe UI", 13, "bold"), corner_radius=10,
+            command=self.do_stop, state="disabled")
+        self.stop_btn.pack(side="right", padx=(8, 0))
+
+        self.start_btn = ctk.CTkButton(ctrl, text="\u25b6  START", width=120, height=42,
+            fg_color=ACCENT, hover_color=ACCENT_HVR, text_color="white",
+            font=("Segoe UI", 13, "bold"), corner_radius=10, command=self.do_start)
+        self.start_btn.pack(side="right")
+
+        # run options
+        self.opts = ctk.CTkFrame(main, fg_color=SURFACE, corner_radius=10,
+            border_width=1, border_color=BORDER)
+        self.opts.pack(fill="x", pady=(0, 10))
+        ctk.CTkLabel(self.opts, text="Output", font=("Segoe UI", 11),
+            text_color=TEXT_DIM).pack(side="left", padx=(12, 6), pady=8)
+        self.out_fmt = ctk.StringVar(value="txt")
+        ctk.CTkSegmentedButton(self.opts, values=list(OUT_FILES), variable=self.out_fmt,
+            font=("Segoe UI", 10), height=26, fg_color=CARD, selected_color=ACCENT,
+            selected_hover_color=ACCENT_HVR, unselected_color=CARD,
+            unselected_hover_color=ACCENT_DIM, text_color=TEXT).pack(side="left", padx=(0, 12), pady=8)
+
+        ctk.CTkLabel(self.opts, text="Skip fresh (h)", font=("Segoe UI", 11),
+            text_color=TEXT_DIM).pack(side="left", padx=(0, 6), pady=8)
+        self.ttl_var = ctk.StringVar(value="0")
+        ctk.CTkEntry(self.opts, textvariable=self.ttl_var, width=48, height=30, fg_color=CARD,
+            border_color=BORDER, border_width=1, text_color=TEXT, font=("Consolas", 13),
+            justify="center").pack(side="left", padx=(0, 12), pady=8)
+
+        ctk.CTkLabel(self.opts, text="Metrics", font=("Segoe UI", 11),
+            text_color=TEXT_DIM).pack(side="left", padx=(0, 6), pady=8)
+        self.metrics_fmt = ctk.StringVar(value="off")
+        ctk.CTkSegmentedButton(self.opts, values=["off", *METRICS_FILES], variable=self.metrics_fmt,
+            font=("Segoe UI", 10), height=26, fg_color=CARD, selected_color=ACCENT,
+            selected_hover_color=ACCENT_HVR, unselected_color=CARD,
+            unselected_hover_color=ACCENT_DIM, text_color=TEXT).pack(side="left", padx=(0, 12), pady=8)
+
+        self.profile_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(self.opts, text="Profile", variable=self.profile_var,
+            font=("Segoe UI", 11), text_color=TEXT_DIM, fg_color=ACCENT, hover_color=ACCENT_HVR,
+            border_color=BORDER, checkbox_width=18, checkbox_height=18
+            ).pack(side="left", padx=(0, 12), pady=8)
+
+        # progress
+        prf = self.make_card(main, pad_bot=10)
+        pri = ctk.CTkFrame(prf, fg_color="transparent")
+        pri.pack(fill="x", padx=16, pady=12)
+
+        self.prog_lbl = ctk.CTkLabel(pri, text="Ready", font=("Segoe UI", 12), text_color=TEXT_DIM)
+        self.prog_lbl.pack(anchor="w")
+
+        self.pbar = ctk.CTkProgressBar(pri, height=14, corner_radius=7,
+            fg_color=CARD, progress_color=ACCENT, border_width=0)
+        self.pbar.pack(fill="x", pady=(6, 10))
+        self.pbar.set(0)
+
+        stats = ctk.CTkFrame(pri, fg_color="transparent")
+        stats.pack(fill="x")
+        self.s_avail = self.make_stat(stats, "Available", GREEN)
+        self.s_taken = self.make_stat(stats, "Taken", RED)
+        self.s_errs = self.make_stat(stats, "Errors", AMBER)
+        self.s_proxy = self.make_stat(stats, "Proxies", CYAN, "\u2014")
+        self.s_rate = self.make_stat(stats, "Rate", TEXT_DIM, "\u2014")
+        perf = ctk.CTkFrame(pri, fg_color="transparent")
+        perf.pack(fill="x", pady=(8, 0))
+        self.s_lat = self.make_stat(perf, "p50 / p95 / p99", TEXT_DIM, "\u2014", size=13)
+        self.s_eta = self.make_stat(perf, "ETA", TEXT_DIM, "\u2014", size=13)
+        self.s_retry = self.make_stat(perf, "Retries", TEXT_DIM, size=13)
+        self.s_limits = self.make_stat(perf, "Rate limits", TEXT_DIM, size=13)
+        self.s_tmo = self.make_stat(perf, "Timeouts", TEXT_DIM, size=13)
+
+        # results
+        rf = self.make_card(main, expand=True)
+        rhdr = ctk.CTkFrame(rf, fg_color="transparent")
+        rhdr.pack(fill="x", padx=16, pady=(12, 4))
+        ctk.CTkLabel(rhdr, text="RESULTS", font=("Segoe UI", 11, "bold"),
+            text_color=TEXT_DIM).pack(side="left")
+        for text, cmd in (("Copy available", self.copy_avail), ("Export", self.export_results)):
+            ctk.CTkButton(rhdr, text=text, width=60, height=24, fg_color=CARD, hover_color=BORDER,
+                text_color=TEXT_DIM, font=("Segoe UI", 10), corner_radius=6,
+                command=cmd).pack(side="left", padx=(8, 0))
+        self.log_filter = ctk.StringVar(value="All")
+        ctk.CTkSegmentedButton(rhdr, values=list(LOG_FILTERS), variable=self.log_filter,
+            font=("Segoe UI", 10), height=26, fg_color=CARD, selected_color=ACCENT,
+            selected_hover_color=ACCENT_HVR, unselected_color=CARD,
+            unselected_hover_color=ACCENT_DIM, text_color=TEXT,
+            command=lambda _: self.refresh_log()).pack(side="right")
+        self.log_count = ctk.CTkLabel(rhdr, text="", font=("Segoe UI", 10), text_color=TEXT_MUTED)
+        self.log_count.pack(side="right", padx=(0, 10))
+        self.log = ctk.CTkTextbox(rf, fg_color=CARD, border_color=BORDER, border_width=1,
+            text_color=TEXT, font=("Consolas", 12), corner_radius=8)
+        self.log.pack(fill="both", expand=True, padx=16, pady=(0, 12))
+        self.log.configure(state="disabled")
+
+        for tag, col in [("avail", GREEN), ("taken", RED), ("err", AMBER),
+                         ("rl", AMBER), ("dim", TEXT_DIM), ("proxy", CYAN)]:
+            self.log._textbox.tag_configure(tag, foreground=col)
+
+    # helpers
+
+    def make_card(self, parent, pad_bot=10, expand=False):
+        f = ctk.CTkFrame(parent, fg_color=SURFACE, corner_radius=12,
+            border_width=1, border_color=BORDER)
+        f.pack(fill="both" if expand else "x", expand=expand, pady=(0, pad_bot))
+        return f
+
+    def section_lbl(self, parent, txt):
+        ctk.CTkLabel(parent, text=txt, font=("Segoe UI", 11, "bold"),
+            text_color=TEXT_DIM).pack(anchor="w", padx=16, pady=(12, 4))
+
+    def make_stat(self, parent, label, color, init="0", size=18):
+        f = ctk.CTkFrame(parent, fg_color="transparent")
+        f.pack(side="left", expand=True)
+        v = ctk.CTkLabel(f, text=init, font=("Segoe UI", size, "bold"), text_color=color)
+        v.pack()
+        ctk.CTkLabel(f, text=label, font=("Segoe UI", 10), text_color=TEXT_MUTED).pack()
+        return v
+
+    def toggle_tok(self):
+        self.show_tok = not self.show_tok
+        self.tok_entry.configure(show="" if self.show_tok else "\u2022")
+
+    def load_names(self):
+        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All", "*.*")])
+        if not path: return
+        if os.path.getsize(path) >= STREAM_BYTES:
+            self.set_names_file(path)
+            return
+        self.set_names_file(None)
+        with open(path, "r", encoding="utf-8") as f:
+            self.names_box.insert("1.0", f.read())
+
+    def set_names_file(self, path):
+        # big lists stay on disk: the box only shows a read-only preview
+        self.names_path, self.names_est = path, None
+        self.names_box.configure(state="normal")
+        self.names_box.delete("1.0", "end")
+        if not path:
+            self.names_lbl.configure(text="")
+            return
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            head = list(itertools.islice(f, PREVIEW_LINES))
+        self.names_box.insert("1.0", "".join(head).rstrip("\n") + "\n\u2026")
+        self.names_box.configure(state="disabled")
+        self.names_lbl.configure(text=f"{os.path.basename(path)}  (counting...)")
+
+        def count():
+            n = count_lines(path)
+            self.after(0, lambda: self.names_counted(path, n))
+        threading.Thread(target=count, daemon=True).start()
+
+    def names_counted(self, path, n):
+        if path != self.names_path: return
+        self.names_est = n
+        self.names_lbl.configure(text=f"{os.path.basename(path)}  ({n:,} lines, streamed)")
+
+    def load_proxies(self):
+        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("All", "*.*")])
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                self.proxy_box.delete("1.0", "end")
+                self.proxy_box.insert("1.0", f.read())
+
+    def write_log(self, text, tag):
+        h = self.history
+        since = len(h)
+        h.catch_up()
+        h.add(text, tag)
+        self.show_new(since)
+
+    def show_new(self, since):
+        # history entries from index `since` on, that the current filter shows
+        self.show_lines(self.history.tail(LOG_FILTERS[self.log_filter.get()], since=since))
+
+    def show_lines(self, items, reset=False):
+        # one text insert for the whole batch: text, tag, text, tag, ...
+        box = self.log._textbox
+        self.log.configure(state="normal")
+        if reset:
+            box.delete("1.0", "end")
+            self._view_n = 0
+        if items:
+            args = []
+            for text, tag in items: args += (text + "\n", tag)
+            box.insert("end", *args)
+            self._view_n += len(items)
+            over = self._view_n - VIEW_LINES
+            if over > 0:
+                box.delete("1.0", f"{over + 1}.0")
+                self._view_n = VIEW_LINES
+            box.see("end")
+        self.log.configure(state="disabled")
+        flt = LOG_FILTERS[self.log_filter.get()]
+        shown, total = self._view_n, self.history.count(flt)
+        self.log_count.configure(text=f"last {shown:,} of {total:,}" if total > shown else "")
+
+    def refresh_log(self):
+        flt = LOG_FILTERS[self.log_filter.get()]
+        self.show_lines(self.history.tail(flt), reset=True)
+
+    def copy_avail(self):
+        t = self.history.table
+        names = t.names(Status.AVAIL) if t else []
+        if not names:
+            self.log_count.configure(text="no available names yet")
+            return
+        self.clipboard_clear()
+        self.clipboard_append("\n".join(names))
+        self.log_count.configure(text=f"copied {len(names):,} available")
+
+    def export_results(self):
+        # whatever the filter shows, from the table, in any output format
+        t = self.history.table
+        if not t or not len(t): return
+        flt = LOG_FILTERS[self.log_filter.get()]
+        path = filedialog.asksaveasfilename(defaultextension=".txt",
+            initialfile=f"results_{flt or 'all'}.txt",
+            filetypes=[("Text", "*.txt"), ("JSON lines", "*.jsonl"), ("CSV", "*.csv")])
+        if not path: return
+        fmt = os.path.splitext(path)[1].lstrip(".").lower()
+
+        def run():
+            try:
+                n = t.export(path, fmt if fmt in OUT_FILES else "txt", STATUS[flt] if flt else None)
+                self.post_log(f" \u25cb Exported {n:,} results to {path}", "dim")
+            except OSError as exc:
+                self.post_log(f" \u26a0 Export failed: {exc}", "err")
+            if not self.running: self.after(0, self.drain)
+        threading.Thread(target=run, daemon=True).start()
+
+    def post_log(self, text, tag):
+        # safe from any thread, picked up by the next pump tick. Notes how many
+        # results had landed so the message keeps its place among them
+        c = self.checker
+        self.ui_q.put((text, tag, len(c.results) if c else 0))
+
+    def drain(self, limit=PUMP_BATCH):
+        h = self.history
+        since, n = len(h), 0
+        try:
+            while n < limit:
+                text, tag, at = self.ui_q.get_nowait()
+                h.catch_up(at)
+                h.add(text, tag)
+                n += 1
+        except Empty: pass
+        h.catch_up()
+        if len(h) > since: self.show_new(since)
+        return n
+
+    def span(self, name):
+        return self.prof.span(name) if self.prof else nullcontext()
+
+    def pump(self):
+        self._pump_id = None
+        with self.span("ui.drain"): self.drain()
+        with self.span("ui.update_stats"): self.update_stats()
+        if self.running:
+            self._pump_id = self.after(PUMP_MS, self.pump)
+
+    def update_stats(self):
+        c = self.checker
+        if not c: return
+        self.s_avail.configure(text=str(c.avail))
+        self.s_taken.configure(text=str(c.taken))
+        self.s_errs.configure(text=str(c.errs))
+        a, t = c.cycler.alive, c.cycler.total
+        self.s_proxy.configure(text=f"{a}/{t}" if t else "off",
+            text_color=GREEN if a == t else AMBER if a else RED)
+        if c.total > 0:
+            # while names are still streaming in, the file's line count is the best total
+            est = max(c.total, self.names_est or 0) if c.feeding else c.total
+            pct = c.checked / est
+            self.pbar.set(pct)
+            state = "Stopping..." if c.stopped else "Checking..."
+            more = "+" if c.feeding else ""
+            self.prog_lbl.configure(text=f"{state}  {c.checked}/{c.total}{more}  ({pct:.0%})")
+        m = c.metrics
+        if c.checked > 0:
+            self.s_rate.configure(text=f"{m.rate():.1f}/s")
+            self.s_lat.configure(text=fmt_latency(m))
+            est = max(c.total, self.names_est) if c.feeding and self.names_est else None
+            eta = c.eta(est)
+            self.s_eta.configure(text=fmt_secs(eta) if self.running else "\u2014")
+        self.s_retry.configure(text=str(m.retries))
+        self.s_limits.configure(text=str(m.limits), text_color=AMBER if m.limits else TEXT_DIM)
+        self.s_tmo.configure(text=str(m.timeouts), text_color=AMBER if m.timeouts else TEXT_DIM)
+
+    def flash(self, msg):
+        self.prog_lbl.configure(text=msg, text_color=RED)
+        self.after(3000, lambda: self.prog_lbl.configure(text="Ready", text_color=TEXT_DIM))
+
+    def pulse(self):
+        if not self.running:
+            self.frames.stop("pulse")
+            self.pbar.configure(progress_color=ACCENT)
+            return
+        t = time.time()
+        f = 0.5 + 0.5 * math.sin(t * 3.5)
+        r = int(0x7c + (0xa7 - 0x7c) * f)
+        g = int(0x3a + (0x8b - 0x3a) * f)
+        b = int(0xed + (0xfa - 0xed) * f)
+        self.pbar.configure(progress_color=f"#{r:02x}{g:02x}{b:02x}")
+
+    # main logic
+
+    def do_start(self):
+        names = None
+        if not self.names_path:
+            names = self.names_box.get("1.0", "end").strip().splitlines()
+        try: ttl = max(0.0, float(self.ttl_var.get()))
+        except ValueError: ttl = 0.0
+        try: n_thr = int(self.thr_var.get())
+        except ValueError: n_thr = 10
+        try: shards = max(1, int(self.shards_var.get()))
+        except ValueError: shards = 1
+        mfmt = self.metrics_fmt.get()
+        mfmt = None if mfmt == "off" else mfmt
+        prof = Profiler().start() if self.profile_var.get() else None
+
+        try:
+            c = make_engine(self.tok_entry.get(), shards=shards, names=names, path=self.names_path,
+                threads=n_thr, engine=self.engine_var.get(),
+                proxies=parse_proxies(self.proxy_box.get("1.0", "end"), self.proxy_type.get()),
+                out_fmt=self.out_fmt.get(), ttl=ttl, metrics_fmt=mfmt, profiler=prof,
+                on_log=self.post_log,
+                on_done=lambda e: self.after(0, self.finish))
+        except ValueError as exc:
+            if prof: prof.stop()
+            self.flash(str(exc))
+            return
+        self.checker = c
+        if prof:
+            # the tk thread itself: every callback, redraw and log insert
+            self.prof, self.frames.profiler = prof, prof
+            self._ui_prof = prof.attach("ui")
+
+        self.running = True
+        self.pbar.set(0)
+        self.history.clear(c.results)
+        self.show_lines([], reset=True)
+        self.start_btn.configure(state="disabled")
+        self.stop_btn.configure(state="normal")
+        self.prog_lbl.configure(text="Checking...  reading names", text_color=TEXT_DIM)
+        for s in (self.s_rate, self.s_lat, self.s_eta): s.configure(text="\u2014")
+        self.s_proxy.configure(
+            text=f"{c.cycler.total}" if c.cycler.total else "off",
+            text_color=CYAN if c.cycler.total else TEXT_MUTED)
+        self.frames.add("pulse", self.pulse, 45)
+        if self._pump_id: self.after_cancel(self._pump_id)
+        self._pump_id = self.after(PUMP_MS, self.pump)
+        c.start()
+
+    def do_stop(self):
+        c = self.checker
+        c.stop()
+        self.prog_lbl.configure(text=f"Stopping...  {c.checked}/{c.total}")
+
+    def finish(self):
+        c = self.checker
+        self.running = False
+        while self.drain(): pass
+        self.update_stats()
+        self.frames.stop("pulse")
+        self.pbar.configure(progress_color=ACCENT)
+        self.start_btn.configure(state="normal")
+        self.stop_btn.configure(state="disabled")
+        self.pbar.set(1.0 if c.checked >= c.total else c.checked / max(c.total, 1))
+        self.prog_lbl.configure(
+            text=f"Done \u2014 {c.checked}/{c.total} checked in {c.elapsed:.1f}s", text_color=GREEN)
+        self.write_log(f"\n Finished in {c.elapsed:.1f}s  "
+            f"({c.avail} available, {c.taken} taken, {c.errs} errors)", "dim")
+        if self.prof: self.end_profile()
+
+    def end_profile(self):
+        prof, self.prof, self.frames.profiler = self.prof, None, None
+        if self._ui_prof: self._ui_prof.disable()
+        self._ui_prof = None
+        prof.stop()
+        try: self.write_log(f" \u25cb Profile written to {prof.dump(PROFILE_FILE)}", "dim")
+        except OSError as exc: self.write_log(f" \u26a0 Profile not written: {exc}", "err")
+
+    def on_close(self):
+        # hide at once, but give a running check CLOSE_WAIT to drain and flush
+        # its results before the process goes
+        if not self.running: return self.destroy()
+        self.checker.stop()
+        self.withdraw()
+        deadline = time.monotonic() + CLOSE_WAIT
+
+        def check():
+            if not self.running or time.monotonic() > deadline: self.destroy()
+            else: self.after(50, check)
+        check()
+
+
+def run_gui():
+    ctk.set_appearance_mode("dark")
+    ctk.set_default_color_theme("dark-blue")
+    App().mainloop()
+
+
+if __name__ == "__main__":
+    run_gui()
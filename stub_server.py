@@ -0,0 +1,149 @@
+import json, random, threading, time, argparse, socket, sys
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# local stand-in for /user/botname/check, for benchmarks and offline runs
+
+CHECK_PATH = "/user/botname/check"
+RATE_LIMIT_BODY = json.dumps({"error": "You have exceeded the site's rate limits. Try again later."})
+MALFORMED = ['{"available": tr', "<html><body>502 Bad Gateway</body></html>", "", "null"]
+
+
+def parse_latency(spec):
+    # "fixed:MS" | "uniform:LO:HI" | "lognormal:MEDIAN:SIGMA" | "exp:MEAN", all in ms
+    kind, *p = spec.split(":")
+    p = [float(x) for x in p]
+    if kind == "fixed": return lambda: p[0] / 1000
+    if kind == "uniform": return lambda: random.uniform(p[0], p[1]) / 1000
+    if kind == "lognormal": return lambda: random.lognormvariate(0, p[1]) * p[0] / 1000
+    if kind == "exp": return lambda: random.expovariate(1 / p[0]) / 1000
+    raise ValueError(f"bad latency spec: {spec}")
+
+
+class Bucket:
+    # server-side token bucket deciding when to answer with the rate-limit body
+    def __init__(self, rate, burst=None):
+        self.rate, self.burst = rate, burst or max(1.0, rate)
+        self.tokens, self.t = self.burst, time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.t) * self.rate)
+            self.t = now
+            if self.tokens < 1: return False
+            self.tokens -= 1
+            return True
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # clients hanging up mid-reply (stop, cancelled tasks) are expected
+        if not isinstance(sys.exc_info()[1], OSError):
+            super().handle_error(request, client_address)
+
+
+class StubServer:
+    def __init__(self, host="127.0.0.1", port=0, latency="lognormal:80:0.5", avail=0.3,
+            malformed=0.0, drop=0.0, rate_limit=None, retry_after=None, stall=0.0, stall_s=30.0):
+        self.latency = parse_latency(latency)
+        self.stall, self.stall_s = stall, stall_s
+        self.avail, self.malformed, self.drop = avail, malformed, drop
+        self.bucket = Bucket(rate_limit) if rate_limit else None
+        self.retry_after = retry_after
+        self.hits = {"ok": 0, "limited": 0, "malformed": 0, "dropped": 0, "stalled": 0}
+        self._lock = threading.Lock()
+        self.httpd = _HTTPServer((host, port), self._handler())
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{CHECK_PATH}"
+
+    def count(self, key):
+        with self._lock: self.hits[key] += 1
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *a): pass
+
+            def reply(self, code, body, headers=()):
+                data = body.encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in headers: self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if self.path != CHECK_PATH:
+                    return self.reply(404, '{"error": "not found"}')
+                if stub.stall and random.random() < stub.stall:
+                    # stuck upstream: answers long after any sane timeout
+                    stub.count("stalled")
+                    time.sleep(stub.stall_s)
+                time.sleep(stub.latency())
+
+                if stub.drop and random.random() < stub.drop:
+                    # connection failure: no response at all
+                    stub.count("dropped")
+                    self.close_connection = True
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+                if stub.bucket and not stub.bucket.take():
+                    stub.count("limited")
+                    ra = [("Retry-After", str(stub.retry_after))] if stub.retry_after is not None else []
+                    return self.reply(429, RATE_LIMIT_BODY, ra)
+                if stub.malformed and random.random() < stub.malformed:
+                    stub.count("malformed")
+                    return self.reply(200, random.choice(MALFORMED))
+                try: name = json.loads(raw)["botname"]
+                except (ValueError, KeyError, TypeError):
+                    return self.reply(400, '{"error": "bad request"}')
+                stub.count("ok")
+                self.reply(200, json.dumps({"botname": name, "available": random.random() < stub.avail}))
+
+        return Handler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="local stand-in for the botname check endpoint")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", default="lognormal:80:0.5",
+        help="fixed:MS | uniform:LO:HI | lognormal:MEDIAN:SIGMA | exp:MEAN")
+    ap.add_argument("--avail", type=float, default=0.3, help="share of names reported available")
+    ap.add_argument("--malformed", type=float, default=0.0, help="share of malformed / non-json replies")
+    ap.add_argument("--drop", type=float, default=0.0, help="share of connections dropped")
+    ap.add_argument("--rate-limit", type=float, help="allowed requests/s before the rate-limit body")
+    ap.add_argument("--retry-after", type=float, help="Retry-After seconds sent with limits")
+    ap.add_argument("--stall", type=float, default=0.0, help="share of requests that hang for --stall-s")
+    ap.add_argument("--stall-s", type=float, default=30.0)
+    a = ap.parse_args(argv)
+    stub = StubServer(a.host, a.port, a.latency, a.avail, a.malformed, a.drop, a.rate_limit, a.retry_after,
+        a.stall, a.stall_s)
+    print(f"serving {stub.url}  (DM_CHECK_URL={stub.url})")
+    try: stub.httpd.serve_forever()
+    except KeyboardInterrupt: pass
+    print(stub.hits)
+
+
+if __name__ == "__main__":
+    main()
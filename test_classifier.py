@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from dark_matter_checker import Classifier, Outcome, classify, load_rules
+
+RATE_LIMIT = json.dumps({"error": "You have exceeded the site's rate limits. Try again later."})
+
+
+@pytest.mark.parametrize("resp, want", [
+    # json verdicts
+    ('{"botname": "abcd", "available": true}', Outcome.AVAIL),
+    ('{"botname": "abcd", "available": false}', Outcome.TAKEN),
+    ('{"botname": "unavailable", "available": true}', Outcome.AVAIL),
+    ('{"botname": "takenbot", "available": true}', Outcome.AVAIL),
+    ('{"botname": "availablebot", "available": false}', Outcome.TAKEN),
+    # json without a verdict is an error, whatever words it contains
+    ('{"detail": "Not available in your region"}', Outcome.ERR),
+    ('{"botname": "availablebot", "error": "unauthorized"}', Outcome.ERR),
+    ('{"error": "name already taken?"}', Outcome.ERR),
+    ('{"available": "yes"}', Outcome.ERR),
+    ('{"available": 1}', Outcome.ERR),
+    ("{}", Outcome.ERR),
+    # truncated json
+    ('{"available": tr', Outcome.ERR),
+    ('{"botname": "availablebot", "avail', Outcome.ERR),
+    # plain text
+    ("This name is available", Outcome.AVAIL),
+    ("Sorry, that name is taken", Outcome.TAKEN),
+    ("Name unavailable", Outcome.TAKEN),
+    ("<html><body>502 Bad Gateway</body></html>", Outcome.ERR),
+    ("", Outcome.ERR),
+    ("null", Outcome.ERR),
+    # rate limits: json body, truncated json body, plain text
+    (RATE_LIMIT, Outcome.LIMITED),
+    (RATE_LIMIT[:-3], Outcome.LIMITED),
+    ("You have EXCEEDED the site's rate limits", Outcome.LIMITED),
+])
+def test_default_rules(resp, want):
+    assert classify(resp) is want
+
+
+def test_json_flag_opts_text_rules_into_json_replies():
+    rules = [{"contains": "maintenance", "json": True, "outcome": "err"},
+        {"regex": r"\bfree\b", "outcome": "avail"},
+        {"field": "status.code", "equals": "free", "outcome": "avail"}]
+    c = Classifier(rules)
+    assert c('{"status": {"code": "free"}}') is Outcome.AVAIL
+    assert c('{"status": "free"}') is Outcome.ERR
+    assert c('{"note": "down for maintenance"}') is Outcome.ERR
+    assert c("name is free") is Outcome.AVAIL
+
+
+def test_field_without_equals_matches_any_value():
+    c = Classifier([{"field": "error", "outcome": "taken"}])
+    assert c('{"error": null}') is Outcome.TAKEN
+    assert c('{"ok": true}') is Outcome.ERR
+
+
+@pytest.mark.parametrize("rule", [
+    {"contains": "x"},
+    {"contains": "x", "outcome": "maybe"},
+    {"regex": "(", "outcome": "err"},
+    {"outcome": "avail"},
+])
+def test_bad_rules_raise(rule):
+    with pytest.raises(ValueError):
+        Classifier([rule])
+
+
+def test_load_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"contains": "yes", "outcome": "avail"}]), encoding="utf-8")
+    assert load_rules(str(path))("yes please") is Outcome.AVAIL
+    path.write_text('{"contains": "yes"}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_rules(str(path))
+    with pytest.raises(ValueError):
+        load_rules(str(tmp_path / "missing.json"))
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from dark_matter_checker import CheckEngine
+from stub_server import StubServer
+
+
+@pytest.fixture
+def stub():
+    s = StubServer(latency="fixed:200", avail=0.5).start()
+    yield s
+    s.stop()
+
+
+def settle(baseline, timeout=5.0):
+    # stub handler threads end once the engine has closed its connections
+    deadline = time.monotonic() + timeout
+    while threading.active_count() > baseline and time.monotonic() < deadline: time.sleep(0.05)
+    return threading.active_count()
+
+
+def test_stop_leaves_no_worker_threads(stub, tmp_path):
+    # a list that fits the queue: names and sentinels are all queued before
+    # the stop, which must not strand idle workers on q.get()
+    baseline = threading.active_count()
+    for run in range(3):
+        e = CheckEngine("x", names=[f"stop{run}{i:03d}" for i in range(30)], threads=10, url=stub.url,
+            cache_path=":memory:", out_path=str(tmp_path / "out.txt")).start()
+        time.sleep(0.3)
+        e.stop()
+        assert e.wait(5)
+        assert settle(baseline) == baseline, [t.name for t in threading.enumerate()]
+
+
+def test_full_run_checks_every_name(stub, tmp_path):
+    baseline = threading.active_count()
+    names = [f"full{i:03d}" for i in range(40)] + ["abc", "full001"]
+    e = CheckEngine("x", names=names, threads=10, url=stub.url, cache_path=":memory:",
+        out_path=str(tmp_path / "out.txt"))
+    e.run()
+    assert e.checked == e.total == 40
+    assert e.avail + e.taken + e.errs == 40
+    assert e.error is None
+    assert settle(baseline) == baseline
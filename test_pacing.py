@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+
+from dark_matter_checker import (AdaptiveTimeout, RateLimiter, TIMEOUT_CONNECT, timeout_kind,
+    timeout_msg)
+
+
+def fed(samples, **kw):
+    # recompute after every sample, so budgets follow the window exactly
+    tmo = AdaptiveTimeout(warmup=1, every=1, **kw)
+    for s in samples: tmo.observe(s)
+    return tmo
+
+
+# adaptive timeouts
+
+def test_defaults_until_warmup():
+    tmo = AdaptiveTimeout(ceiling=15.0, warmup=30, every=25)
+    assert tmo.budget == (TIMEOUT_CONNECT, 15.0)
+    for _ in range(29): tmo.observe(0.05)
+    assert tmo.budget == (TIMEOUT_CONNECT, 15.0)
+    tmo.observe(0.05)
+    assert tmo.budget == (1.0, 1.0)
+
+
+def test_defaults_respect_a_low_ceiling():
+    assert AdaptiveTimeout(ceiling=3.0).budget == (3.0, 3.0)
+
+
+def test_budgets_follow_p50_and_p99():
+    tmo = fed([0.5] * 98 + [2.0] * 2)
+    assert tmo.budget == (1.5, 6.0)
+
+
+@pytest.mark.parametrize("latency, want", [(0.01, (1.0, 1.0)), (10.0, (15.0, 15.0)), (0.4, (1.2, 1.2))])
+def test_budgets_clamped_to_floor_and_ceiling(latency, want):
+    assert fed([latency] * 50, ceiling=15.0).budget == want
+
+
+def test_timeout_widens_only_the_budget_that_fired():
+    tmo = fed([0.05] * 50)
+    used = tmo.budget
+    tmo.timed_out("read", used)
+    assert tmo.budget == (1.0, 2.0)
+    tmo.timed_out("connect", used)
+    assert tmo.budget == (2.0, 2.0)
+
+
+def test_concurrent_timeouts_widen_once():
+    tmo = fed([0.05] * 50)
+    used = tmo.budget
+    threads = [threading.Thread(target=tmo.timed_out, args=("read", used)) for _ in range(20)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert tmo.read == 2.0
+    tmo.timed_out("read", tmo.budget)  # a later timeout at the wider budget widens again
+    assert tmo.read == 4.0
+
+
+def test_widening_capped_at_ceiling():
+    tmo = fed([0.05] * 50, ceiling=15.0)
+    tmo.timed_out("read", (1.0, 10.0))
+    assert tmo.read == 15.0
+    assert tmo.full == (15.0, 15.0)
+
+
+def test_slower_server_recovers_instead_of_timing_out():
+    # budgets learned at 50 ms, then the server needs 1.3s per reply
+    tmo = AdaptiveTimeout(ceiling=15.0)
+    for _ in range(150): tmo.observe(0.05)
+    assert tmo.read == 1.0
+    tmo.timed_out("read", tmo.budget)
+    assert tmo.read > 1.3
+    for _ in range(25): tmo.observe(1.3)
+    assert tmo.read > 1.3
+
+
+def test_recompute_narrows_after_a_stall():
+    tmo = fed([0.05] * 50)
+    tmo.timed_out("read", tmo.budget)
+    tmo.observe(0.05)
+    assert tmo.budget == (1.0, 1.0)
+
+
+@pytest.mark.parametrize("exc, kind", [
+    (type("ConnectTimeout", (Exception,), {})("HTTPConnectionPool(host='x'): connect timed out"), "connect"),
+    (type("ReadTimeout", (Exception,), {})("HTTPConnectionPool(host='x'): Read timed out."), "read"),
+    (Exception("Connection timeout to host http://x"), "connect"),
+    (Exception("Timeout on reading data from socket"), "read"),
+])
+def test_timeout_kind(exc, kind):
+    assert timeout_kind(exc) == kind
+    assert timeout_msg(exc, (1.0, 2.5)) == f"timed out ({kind}, budget 1s / 2.5s)"
+
+
+# rate limiter
+
+def test_unpaced_until_the_first_limit():
+    rl = RateLimiter()
+    assert rl.rate is None
+    assert all(rl.acquire() for _ in range(100))
+
+
+def test_limit_pauses_once_per_cooldown():
+    rl = RateLimiter(cooldown=10.0)
+    assert rl.limited() == 10.0
+    assert rl.limited() is None
+    assert rl.limited(retry=3.0) is None
+    assert rl.hits == 3
+
+
+def test_retry_after_sets_the_pause():
+    assert RateLimiter(cooldown=10.0).limited(retry=2.5) == 2.5
+
+
+def test_limit_halves_the_rate_down_to_the_floor():
+    rl = RateLimiter(min_rate=0.5)
+    rl.rate = 8.0
+    rl.limited(retry=0.0)
+    assert rl.rate == 4.0
+    rl.limited(retry=0.0)
+    assert rl.rate == 2.0
+    rl.rate = 0.6
+    rl.limited(retry=0.0)
+    assert rl.rate == 0.5
+
+
+def test_stop_during_cooldown_releases_waiters():
+    rl = RateLimiter()
+    rl.limited(retry=30.0)
+    stop = threading.Event()
+    stop.set()
+    assert rl.acquire(stop) is False
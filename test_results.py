@@ -0,0 +1,30 @@
+import threading
+
+from dark_matter_checker import ResultTable, Status
+
+
+def test_readers_never_see_a_half_appended_row():
+    # the writer thread appends while another thread reads the newest rows of
+    # each status; every row handed out must already be complete
+    t = ResultTable()
+    done = threading.Event()
+    bad = []
+
+    def writer():
+        for i in range(200_000): t.append(f"name{i}", Status(i % 3), "resp")
+        done.set()
+
+    w = threading.Thread(target=writer)
+    w.start()
+    while not done.is_set():
+        for st in Status:
+            for r in (*t.tail(st, 5), *t.rows(st)[-5:]):
+                try:
+                    if Status(t.status[r]) is not st: bad.append(r)
+                    t.line(r)
+                except IndexError:
+                    bad.append(r)
+    w.join()
+    assert not bad
+    assert len(t) == 200_000
+    assert all(t.count(st) == len(t.rows(st)) for st in Status)